@@ -24,7 +24,7 @@ def demo_raw_api():
 ```c
 """
     
-    response_text = ""
+    parts = []
     for chunk in client.generate_raw(
         model="qwen2.5-coder:1.5b",
         prompt=prompt,
@@ -34,7 +34,8 @@ def demo_raw_api():
         max_tokens=500
     ):
         if "response" in chunk:
-            response_text += chunk["response"]
+            parts.append(chunk["response"])
+    response_text = "".join(parts)
     
     # Clean and display
     clean_code = client.strip_thinking_tags(response_text)
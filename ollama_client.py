@@ -5,17 +5,136 @@ Bypasses the official library to reduce overhead and gain direct control.
 """
 
 import json
-import re
 from typing import Optional, Dict, Any, Generator
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Minimal, direct code prompts keyed by lowercased language
+_CODE_PROMPTS = {
+    "c": "Write a C program that {task}. Output only the code, no explanation.\n```c\n",
+    "bash": "Write a bash script that {task}. Output only the code, no explanation.\n```bash\n",
+    "sh": "Write a bash script that {task}. Output only the code, no explanation.\n```bash\n",
+}
+_FALLBACK_CODE_PROMPT = "Write {language} code that {task}. Output only the code.\n```{language}\n"
+
+_FENCE = '```'
+_FENCE_TAG_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_+-')
+
+
+# Thinking/thought tag pairs emitted by reasoning models. The flag marks
+# tags whose unclosed form is stripped through to the end of the text.
+_THINKING_TAGS = (
+    ('<thinking>', '</thinking>', True),
+    ('<thought>', '</thought>', True),
+    ('<think>', '</think>', False),
+    ('<|thinking|>', '<|/thinking|>', False),
+    ('<|thought|>', '<|/thought|>', False),
+)
+
+
+def _strip_thinking_spans(text: str) -> str:
+    """
+    Splice thinking blocks out of text in one left-to-right scan.
+    Only '<' positions are inspected, and a closing tag found missing is
+    never searched for again, so the scan stays linear on long outputs.
+    """
+    parts = []
+    missing = set()
+    keep = 0
+    pos = text.find('<')
+    
+    while pos != -1:
+        for open_tag, close_tag, strip_unclosed in _THINKING_TAGS:
+            if text.startswith(open_tag, pos):
+                break
+        else:
+            pos = text.find('<', pos + 1)
+            continue
+        
+        end = -1
+        if close_tag not in missing:
+            end = text.find(close_tag, pos + len(open_tag))
+        
+        if end == -1:
+            missing.add(close_tag)
+            if strip_unclosed:
+                parts.append(text[keep:pos])
+                keep = len(text)
+                break
+            pos = text.find('<', pos + 1)
+            continue
+        
+        parts.append(text[keep:pos])
+        keep = end + len(close_tag)
+        pos = text.find('<', keep)
+    
+    parts.append(text[keep:])
+    return ''.join(parts)
+
+
+def _extract_fenced_code(text: str) -> Optional[str]:
+    """
+    Return the body of the first complete ``` block, or None if there is none.
+    The optional language tag and the newline after it are skipped.
+    """
+    start = text.find(_FENCE)
+    if start == -1:
+        return None
+    
+    body = start + len(_FENCE)
+    while body < len(text) and text[body] in _FENCE_TAG_CHARS:
+        body += 1
+    if text.startswith('\n', body):
+        body += 1
+    
+    end = text.find(_FENCE, body)
+    if end == -1:
+        return None
+    return text[body:end]
 
 
 class MinimalOllamaClient:
     """Lightweight Ollama client focused on raw API access."""
     
-    def __init__(self, base_url: str = "http://localhost:11434"):
+    # Session shared by every instance, so keep-alive connections survive
+    # clients being created and closed repeatedly
+    _shared_session: Optional[requests.Session] = None
+    
+    def __init__(
+        self,
+        base_url: str = "http://localhost:11434",
+        session: Optional[requests.Session] = None
+    ):
         self.base_url = base_url
-        self.session = requests.Session()
+        self.session = session or self._get_shared_session()
+        
+    @classmethod
+    def _get_shared_session(cls) -> requests.Session:
+        """Get the class-wide session, creating its connection pool on first use."""
+        if cls._shared_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=16,
+                pool_maxsize=64,
+                max_retries=Retry(total=2, backoff_factor=0.1)
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            cls._shared_session = session
+        return cls._shared_session
         
     def generate_raw(
         self,
@@ -61,7 +180,8 @@ class MinimalOllamaClient:
         
         response = self.session.post(
             f"{self.base_url}/api/generate",
-            json=payload,
+            data=_json_dumps(payload),
+            headers=_JSON_HEADERS,
             stream=stream
         )
         response.raise_for_status()
@@ -69,9 +189,9 @@ class MinimalOllamaClient:
         if stream:
             for line in response.iter_lines():
                 if line:
-                    yield json.loads(line)
+                    yield _json_loads(line)
         else:
-            yield response.json()
+            yield _json_loads(response.content)
     
     def chat_raw(
         self,
@@ -94,7 +214,8 @@ class MinimalOllamaClient:
         
         response = self.session.post(
             f"{self.base_url}/api/chat",
-            json=payload,
+            data=_json_dumps(payload),
+            headers=_JSON_HEADERS,
             stream=stream
         )
         response.raise_for_status()
@@ -102,9 +223,9 @@ class MinimalOllamaClient:
         if stream:
             for line in response.iter_lines():
                 if line:
-                    yield json.loads(line)
+                    yield _json_loads(line)
         else:
-            yield response.json()
+            yield _json_loads(response.content)
     
     @staticmethod
     def strip_thinking_tags(text: str) -> str:
@@ -112,23 +233,10 @@ class MinimalOllamaClient:
         Remove common thinking/thought tags from model output.
         Handles various formats: <thinking>, <thought>, <|thinking|>, etc.
         """
-        # Common thinking tag patterns
-        patterns = [
-            r'<thinking>.*?</thinking>',
-            r'<thought>.*?</thought>',
-            r'<\|thinking\|>.*?<\|/thinking\|>',
-            r'<\|thought\|>.*?<\|/thought\|>',
-            r'<think>.*?</think>',
-            # Also handle unclosed tags at the end
-            r'<thinking>.*$',
-            r'<thought>.*$',
-        ]
-        
-        result = text
-        for pattern in patterns:
-            result = re.sub(pattern, '', result, flags=re.DOTALL)
-        
-        return result.strip()
+        # Most outputs carry no tags at all; skip the scan for them
+        if '<think' not in text and '<thought' not in text and '<|th' not in text:
+            return text.strip()
+        return _strip_thinking_spans(text).strip()
     
     def generate_code(
         self,
@@ -147,15 +255,11 @@ class MinimalOllamaClient:
             language: Target language (c, bash, etc.)
         """
         # Craft a minimal, direct prompt
-        if language.lower() == "c":
-            prompt = f"Write a C program that {task}. Output only the code, no explanation.\n```c\n"
-        elif language.lower() in ["bash", "sh"]:
-            prompt = f"Write a bash script that {task}. Output only the code, no explanation.\n```bash\n"
-        else:
-            prompt = f"Write {language} code that {task}. Output only the code.\n```{language}\n"
+        template = _CODE_PROMPTS.get(language.lower(), _FALLBACK_CODE_PROMPT)
+        prompt = template.format(task=task, language=language)
         
         # Get the full response
-        response_text = ""
+        parts = []
         for chunk in self.generate_raw(
             model=model,
             prompt=prompt,
@@ -165,21 +269,21 @@ class MinimalOllamaClient:
             max_tokens=2048
         ):
             if "response" in chunk:
-                response_text += chunk["response"]
+                parts.append(chunk["response"])
+        response_text = "".join(parts)
         
         # Strip thinking tags
         clean_text = self.strip_thinking_tags(response_text)
         
-        # Extract code from markdown blocks
-        code_pattern = rf'```(?:{language}|c|bash|sh)?\n?(.*?)```'
-        matches = re.findall(code_pattern, clean_text, re.DOTALL)
-        
-        if matches:
-            return matches[0].strip()
+        # Extract code from the first markdown block
+        code = _extract_fenced_code(clean_text)
+        if code is not None:
+            return code.strip()
         
         # If no code blocks, return cleaned text
         return clean_text.strip()
     
     def close(self):
-        """Close the session."""
-        self.session.close()
\ No newline at end of file
+        """Close the session, unless it is the shared one other clients reuse."""
+        if self.session is not MinimalOllamaClient._shared_session:
+            self.session.close()
\ No newline at end of file
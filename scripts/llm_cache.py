@@ -0,0 +1,52 @@
+"""
+Disk-backed cache of model responses for replaying test runs
+"""
+
+import hashlib
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+CACHE_DIR = Path(__file__).parent.parent / 'evaluation' / '.llm_cache'
+
+
+def cache_enabled() -> bool:
+    """Responses are only cached when BLOSSOM_LLM_CACHE=1"""
+    return os.getenv('BLOSSOM_LLM_CACHE', '0') == '1'
+
+
+def cache_key(model: str, prompt: str, attempt: int) -> str:
+    """Key a response by model, prompt and attempt number.
+
+    Sampled responses differ between attempts, so each retry gets its own
+    entry and a replayed run sees the same sequence of responses.
+    """
+    return hashlib.sha256(f"{model}\0{attempt}\0{prompt}".encode()).hexdigest()
+
+
+def _cache_path(key: str) -> Path:
+    return CACHE_DIR / key[:2] / f'{key}.txt'
+
+
+@lru_cache(maxsize=256)
+def _load_from_disk(key: str) -> str:
+    # Misses raise FileNotFoundError, which lru_cache does not memoize
+    return _cache_path(key).read_text()
+
+
+def load(key: str) -> Optional[str]:
+    """Return the cached response for key, or None on a miss"""
+    try:
+        return _load_from_disk(key)
+    except FileNotFoundError:
+        return None
+
+
+def store(key: str, response: str):
+    """Write a response through to disk"""
+    path = _cache_path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    tmp_path.write_text(response)
+    os.replace(tmp_path, path)
@@ -3,43 +3,126 @@ LLM API client wrapper for Ollama and Anthropic with detailed logging
 """
 
 import os
-import asyncio
 import logging
+import queue
+import atexit
 import time
 import json
-from typing import Optional, Dict, Any
+from logging.handlers import QueueHandler, QueueListener
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, DefaultDict, FrozenSet, Tuple
 import ollama
 from anthropic import AsyncAnthropic
 from dotenv import load_dotenv
 from datetime import datetime
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging. Records are queued and written by a listener thread,
+# so generation coroutines never block on console I/O.
+if not logging.getLogger().handlers:
+    _log_handler = logging.StreamHandler()
+    _log_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    _log_queue = queue.SimpleQueue()
+    _queue_handler = QueueHandler(_log_queue)
+    _queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    logging.basicConfig(
+        level=os.getenv('LOG_LEVEL', 'INFO').upper(),
+        handlers=[_queue_handler]
+    )
+    _log_listener = QueueListener(_log_queue, _log_handler)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
 logger = logging.getLogger('ModelClient')
 
 
+class ConfigurationError(ValueError):
+    """A backend is not configured, so every request to it will fail"""
+
+
+# Rough characters per token, for estimating output size without tokenizing
+_CHARS_PER_TOKEN = 4
+
+
+def _code_block_closed(text: str) -> bool:
+    """Check whether a streamed response already holds a complete code block.
+    
+    Follows the extraction rule in run_challenge: prompts end with an open
+    ```python fence, so text followed by an untagged fence is code that the
+    fence closes. A tagged fence opens a new block (often after prose) and
+    needs a second fence. Fences inside an unfinished <think> section are
+    ignored.
+    """
+    think_end = text.rfind('</think>')
+    if think_end >= 0:
+        text = text[think_end + len('</think>'):]
+    elif '<think>' in text:
+        return False
+        
+    opening = text.find('```')
+    if opening < 0:
+        return False
+    if text[:opening].strip():
+        # The tag (if any) is only known once the fence line is complete
+        line_end = text.find('\n', opening + 3)
+        if line_end >= 0 and not text[opening + 3:line_end].strip():
+            return True
+    return text.find('```', opening + 3) >= 0
+
+
+@dataclass(slots=True)
+class ModelStats:
+    """Generation counters for a single model"""
+    count: int = 0
+    total_time: float = 0.0
+    
+    @property
+    def avg_time(self) -> float:
+        return self.total_time / self.count if self.count else 0.0
+
+
+@dataclass
+class GenerationStats:
+    """Running generation counters, updated in place per request"""
+    total_generations: int = 0
+    total_tokens: int = 0
+    total_time: float = 0.0
+    models_used: DefaultDict[str, ModelStats] = field(default_factory=lambda: defaultdict(ModelStats))
+    
+    @property
+    def avg_time(self) -> float:
+        return self.total_time / self.total_generations if self.total_generations else 0.0
+        
+    @property
+    def avg_tokens(self) -> float:
+        return self.total_tokens / self.total_generations if self.total_generations else 0.0
+
+
 class ModelClient:
     """Unified client for LLM APIs with comprehensive logging"""
     
+    __slots__ = (
+        'verbose', 'ollama_host', 'ollama_keep_alive', 'ollama_client', 'ollama_async',
+        'model_cache_ttl', '_model_cache', 'stats', 'anthropic', '_backends',
+    )
+    
     def __init__(self, verbose=True):
         load_dotenv()
         self.verbose = verbose
         self.ollama_host = os.getenv('OLLAMA_HOST', 'http://localhost:11434')
+        # Keep models (and their prompt KV cache) loaded between attempts
+        self.ollama_keep_alive = os.getenv('OLLAMA_KEEP_ALIVE', '30m')
         self.ollama_client = ollama.Client(host=self.ollama_host)
+        self.ollama_async = ollama.AsyncClient(host=self.ollama_host)
         
         logger.info(f"Initializing ModelClient")
-        logger.debug(f"Ollama host: {self.ollama_host}")
+        logger.debug("Ollama host: %s", self.ollama_host)
+        
+        # Ollama model names as (fetched_at, names), refreshed after the TTL
+        self.model_cache_ttl = 30
+        self._model_cache: Tuple[float, Optional[FrozenSet[str]]] = (0.0, None)
         
         # Track generation statistics
-        self.stats = {
-            'total_generations': 0,
-            'total_tokens': 0,
-            'total_time': 0,
-            'models_used': {}
-        }
+        self.stats = GenerationStats()
         
         # Anthropic for expert model (optional)
         api_key = os.getenv('ANTHROPIC_API_KEY')
@@ -49,49 +132,57 @@ class ModelClient:
         else:
             self.anthropic = None
             logger.debug("No Anthropic API key found")
+        
+        # Backend per model, keyed by model.startswith('claude')
+        self._backends = {True: self._generate_anthropic, False: self._generate_ollama}
             
     async def generate(
         self, 
         model: str, 
         prompt: str,
         temperature: Optional[float] = None,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        stop_after_code: bool = False,
+        seed: Optional[int] = None
     ) -> str:
-        """Generate completion from model with detailed logging"""
+        """Generate completion from model with detailed logging.
+        
+        With stop_after_code, Ollama generation is streamed and cut off as
+        soon as the code block is closed instead of waiting for any
+        trailing commentary. A seed makes Ollama sampling reproducible.
+        """
         
         start_time = time.time()
-        self.stats['total_generations'] += 1
+        self.stats.total_generations += 1
         
         logger.info(f"\n{'='*60}")
-        logger.info(f"Generation Request #{self.stats['total_generations']}")
+        logger.info(f"Generation Request #{self.stats.total_generations}")
         logger.info(f"Model: {model}")
-        logger.debug(f"Prompt length: {len(prompt)} characters")
-        logger.debug(f"Temperature: {temperature or 'default'}")
-        logger.debug(f"Max tokens: {max_tokens or 'default'}")
+        logger.debug("Prompt length: %s characters", len(prompt))
+        logger.debug("Temperature: %s", temperature or 'default')
+        logger.debug("Max tokens: %s", max_tokens or 'default')
         
-        if self.verbose:
-            logger.debug(f"First 200 chars of prompt: {prompt[:200]}...")
+        if self.verbose and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("First 200 chars of prompt: %s...", prompt[:200])
         
         try:
-            if model.startswith('claude'):
-                response = await self._generate_anthropic(model, prompt, temperature, max_tokens)
-            else:
-                response = await self._generate_ollama(model, prompt, temperature, max_tokens)
+            backend = self._backends[model.startswith('claude')]
+            response = await backend(model, prompt, temperature, max_tokens, stop_after_code, seed)
             
             elapsed = time.time() - start_time
-            self.stats['total_time'] += elapsed
-            self.stats['total_tokens'] += len(response.split())
+            self.stats.total_time += elapsed
+            approx_tokens = len(response) // _CHARS_PER_TOKEN
+            self.stats.total_tokens += approx_tokens
             
-            if model not in self.stats['models_used']:
-                self.stats['models_used'][model] = {'count': 0, 'total_time': 0}
-            self.stats['models_used'][model]['count'] += 1
-            self.stats['models_used'][model]['total_time'] += elapsed
+            model_stats = self.stats.models_used[model]
+            model_stats.count += 1
+            model_stats.total_time += elapsed
             
             logger.info(f"Generation completed in {elapsed:.2f}s")
-            logger.debug(f"Response length: {len(response)} characters, ~{len(response.split())} tokens")
-            
-            if self.verbose:
-                logger.debug(f"First 200 chars of response: {response[:200]}...")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Response length: %s characters, ~%s tokens", len(response), approx_tokens)
+                if self.verbose:
+                    logger.debug("First 200 chars of response: %s...", response[:200])
             
             logger.info(f"{'='*60}\n")
             
@@ -100,7 +191,7 @@ class ModelClient:
         except Exception as e:
             elapsed = time.time() - start_time
             logger.error(f"Generation failed after {elapsed:.2f}s: {e}")
-            logger.debug(f"Error details:", exc_info=True)
+            logger.debug("Error details:", exc_info=True)
             raise
             
     async def _generate_ollama(
@@ -108,160 +199,224 @@ class ModelClient:
         model: str,
         prompt: str,
         temperature: Optional[float] = None,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        stop_after_code: bool = False,
+        seed: Optional[int] = None
     ) -> str:
         """Generate using Ollama with detailed logging"""
         
-        logger.debug(f"Using Ollama backend for {model}")
+        logger.debug("Using Ollama backend for %s", model)
         
-        # Run in executor since ollama client is sync
-        loop = asyncio.get_event_loop()
+        generation_start = time.time()
+        logger.debug("Sending request to Ollama at %s", self.ollama_host)
         
-        def _generate():
-            generation_start = time.time()
-            logger.debug(f"Sending request to Ollama at {self.ollama_host}")
-            
-            options = {
-                'temperature': temperature or 0.3,
-                'num_predict': max_tokens or 2048,
-                'stop': ['```\n\n', '```\n#', '```\nclass'],  # Stop at end of code block
-            }
-            
-            logger.debug(f"Generation options: {json.dumps(options, indent=2)}")
-            
-            try:
-                response = self.ollama_client.generate(
-                    model=model,
-                    prompt=prompt,
-                    options=options
-                )
-            except Exception as e:
-                if "pull" in str(e).lower() or "not found" in str(e).lower():
-                    logger.warning(f"Model {model} not found locally. Attempting to pull it...")
-                    # Try to pull the model first
-                    try:
-                        self.ollama_client.pull(model)
-                        logger.info(f"Successfully pulled model {model}")
-                        # Retry generation after pull
-                        response = self.ollama_client.generate(
-                            model=model,
-                            prompt=prompt,
-                            options=options
-                        )
-                    except Exception as pull_error:
-                        logger.error(f"Failed to pull model {model}: {pull_error}")
-                        raise
-                else:
+        options = {
+            'temperature': temperature or 0.3,
+            'num_predict': max_tokens or 2048,
+            'stop': ['```\n\n', '```\n#', '```\nclass'],  # Stop at end of code block
+        }
+        if seed is not None:
+            options['seed'] = seed
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Generation options: %s", json.dumps(options, indent=2))
+        
+        try:
+            text, response = await self._ollama_generate(model, prompt, options, stop_after_code)
+        except Exception as e:
+            if "pull" in str(e).lower() or "not found" in str(e).lower():
+                logger.warning(f"Model {model} not found locally. Attempting to pull it...")
+                # Try to pull the model first
+                try:
+                    await self.ollama_async.pull(model)
+                    logger.info(f"Successfully pulled model {model}")
+                    self._model_cache = (0.0, None)
+                    # Retry generation after pull
+                    text, response = await self._ollama_generate(model, prompt, options, stop_after_code)
+                except Exception as pull_error:
+                    logger.error(f"Failed to pull model {model}: {pull_error}")
                     raise
-            
-            generation_time = time.time() - generation_start
-            
-            # Log response metadata if available
-            if isinstance(response, dict):
-                logger.debug(f"Ollama response metadata:")
+            else:
+                raise
+        
+        generation_time = time.time() - generation_start
+        
+        # Log response metadata if available (absent when the stream was cut)
+        if isinstance(response, dict):
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Ollama response metadata:")
                 for key in ['total_duration', 'load_duration', 'eval_count', 'eval_duration']:
                     if key in response:
-                        logger.debug(f"  {key}: {response[key]}")
-                
-                if 'eval_count' in response and 'eval_duration' in response:
-                    tokens_per_sec = response['eval_count'] / (response['eval_duration'] / 1e9)
-                    logger.info(f"Generation speed: {tokens_per_sec:.1f} tokens/sec")
+                        logger.debug("  %s: %s", key, response[key])
             
-            logger.debug(f"Ollama generation completed in {generation_time:.2f}s")
-            return response['response']
+            if 'eval_count' in response and 'eval_duration' in response:
+                tokens_per_sec = response['eval_count'] / (response['eval_duration'] / 1e9)
+                logger.info(f"Generation speed: {tokens_per_sec:.1f} tokens/sec")
+        
+        logger.debug("Ollama generation completed in %.2fs", generation_time)
+        return text
+        
+    async def _ollama_generate(
+        self,
+        model: str,
+        prompt: str,
+        options: Dict[str, Any],
+        stop_after_code: bool
+    ) -> Tuple[str, Optional[Any]]:
+        """Run one Ollama generation, returning its text and final response.
+        
+        The final response carries the timing metadata; it is None when the
+        stream was closed early after the code block.
+        """
+        if not stop_after_code:
+            response = await self.ollama_async.generate(
+                model=model,
+                prompt=prompt,
+                options=options,
+                keep_alive=self.ollama_keep_alive
+            )
+            return response['response'], response
             
-        return await loop.run_in_executor(None, _generate)
+        parts = []
+        stream = await self.ollama_async.generate(
+            model=model,
+            prompt=prompt,
+            options=options,
+            keep_alive=self.ollama_keep_alive,
+            stream=True
+        )
+        async for chunk in stream:
+            piece = chunk['response']
+            parts.append(piece)
+            if chunk.get('done'):
+                return "".join(parts), chunk
+            # A fence's tag line may finish in a later chunk, so newlines
+            # trigger the check too
+            if ('`' in piece or '\n' in piece) and _code_block_closed("".join(parts)):
+                # Closing the stream aborts the request, so Ollama stops
+                # generating the remainder
+                await stream.aclose()
+                logger.debug("Code block closed, stopped streaming from %s", model)
+                break
+                
+        return "".join(parts), None
         
     async def _generate_anthropic(
         self,
         model: str,
         prompt: str,
         temperature: Optional[float] = None,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        stop_after_code: bool = False,
+        seed: Optional[int] = None
     ) -> str:
         """Generate using Anthropic with detailed logging"""
         
-        logger.debug(f"Using Anthropic backend for {model}")
+        logger.debug("Using Anthropic backend for %s", model)
         
         if not self.anthropic:
             logger.error("Anthropic API key not configured")
-            raise ValueError("Anthropic API key not configured")
+            raise ConfigurationError("Anthropic API key not configured")
         
         generation_start = time.time()
-        logger.debug(f"Sending request to Anthropic API")
+        logger.debug("Sending request to Anthropic API")
         
         params = {
             'model': model,
             'max_tokens': max_tokens or 4096,
             'temperature': temperature or 0.3,
         }
-        logger.debug(f"Generation parameters: {json.dumps(params, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Generation parameters: %s", json.dumps(params, indent=2))
             
         response = await self.anthropic.messages.create(
             **params,
             messages=[
-                {"role": "user", "content": prompt}
+                {
+                    "role": "user",
+                    "content": [
+                        # Mark the prompt cacheable so retries reuse its prefill
+                        {"type": "text", "text": prompt, "cache_control": {"type": "ephemeral"}}
+                    ]
+                }
             ]
         )
         
         generation_time = time.time() - generation_start
         
         # Log response metadata
-        logger.debug(f"Anthropic response metadata:")
-        logger.debug(f"  Model: {response.model}")
-        logger.debug(f"  Usage: {response.usage}")
-        logger.debug(f"  Stop reason: {response.stop_reason}")
+        logger.debug("Anthropic response metadata:")
+        logger.debug("  Model: %s", response.model)
+        logger.debug("  Usage: %s", response.usage)
+        logger.debug("  Stop reason: %s", response.stop_reason)
         
         if response.usage:
             logger.info(f"Token usage - Input: {response.usage.input_tokens}, Output: {response.usage.output_tokens}")
         
-        logger.debug(f"Anthropic generation completed in {generation_time:.2f}s")
+        logger.debug("Anthropic generation completed in %.2fs", generation_time)
         
         return response.content[0].text
         
     async def check_model(self, model: str) -> bool:
         """Check if model is available with logging"""
         
-        logger.debug(f"Checking availability of model: {model}")
+        logger.debug("Checking availability of model: %s", model)
         
         try:
             if model.startswith('claude'):
                 available = self.anthropic is not None
-                logger.debug(f"Anthropic model {model}: {'available' if available else 'not configured'}")
+                logger.debug("Anthropic model %s: %s", model, 'available' if available else 'not configured')
                 return available
             else:
                 # Check Ollama
-                logger.debug(f"Querying Ollama for available models...")
-                models = self.ollama_client.list()
-                available_models = [m['name'] for m in models['models']]
-                logger.debug(f"Available Ollama models: {available_models}")
+                available_models = self._list_ollama_models()
+                logger.debug("Available Ollama models: %s", available_models)
                 
-                available = any(m['name'] == model for m in models['models'])
+                available = model in available_models
                 if not available:
                     logger.warning(f"Model {model} not found in Ollama, but will attempt to use it anyway (may auto-pull)")
                     return True  # Allow attempting to use any model - Ollama may auto-pull it
-                logger.debug(f"Model {model}: found")
+                logger.debug("Model %s: found", model)
                 return available
         except Exception as e:
             logger.warning(f"Could not check model availability: {e}, assuming model is available")
             return True  # Be permissive on errors
     
+    def _list_ollama_models(self) -> FrozenSet[str]:
+        """Get names of locally available Ollama models, cached for a short TTL"""
+        fetched_at, names = self._model_cache
+        if names is not None and time.time() - fetched_at < self.model_cache_ttl:
+            return names
+            
+        logger.debug("Querying Ollama for available models...")
+        models = self.ollama_client.list()
+        names = frozenset(m['name'] for m in models['models'])
+        self._model_cache = (time.time(), names)
+        return names
+        
     def get_stats(self) -> Dict[str, Any]:
         """Get generation statistics"""
-        stats = self.stats.copy()
+        stats = {
+            'total_generations': self.stats.total_generations,
+            'total_tokens': self.stats.total_tokens,
+            'total_time': self.stats.total_time,
+            'models_used': {
+                model: {'count': ms.count, 'total_time': ms.total_time}
+                for model, ms in self.stats.models_used.items()
+            }
+        }
         
-        if stats['total_generations'] > 0:
-            stats['avg_time'] = stats['total_time'] / stats['total_generations']
-            stats['avg_tokens'] = stats['total_tokens'] / stats['total_generations']
+        if self.stats.total_generations > 0:
+            stats['avg_time'] = self.stats.avg_time
+            stats['avg_tokens'] = self.stats.avg_tokens
         
         logger.info("Generation Statistics:")
-        logger.info(f"  Total generations: {stats['total_generations']}")
-        logger.info(f"  Total time: {stats['total_time']:.2f}s")
-        logger.info(f"  Average time: {stats.get('avg_time', 0):.2f}s")
-        logger.info(f"  Total tokens: {stats['total_tokens']}")
-        
-        for model, model_stats in stats['models_used'].items():
-            avg = model_stats['total_time'] / model_stats['count']
-            logger.info(f"  {model}: {model_stats['count']} generations, avg {avg:.2f}s")
+        logger.info(f"  Total generations: {self.stats.total_generations}")
+        logger.info(f"  Total time: {self.stats.total_time:.2f}s")
+        logger.info(f"  Average time: {self.stats.avg_time:.2f}s")
+        logger.info(f"  Total tokens: {self.stats.total_tokens}")
+        
+        for model, model_stats in self.stats.models_used.items():
+            logger.info(f"  {model}: {model_stats.count} generations, avg {model_stats.avg_time:.2f}s")
         
         return stats
\ No newline at end of file
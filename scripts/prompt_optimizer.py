@@ -2,13 +2,180 @@
 Prompt optimization for small LLMs
 """
 
-from typing import Dict, Any, List
+from types import MappingProxyType
+from typing import Dict, Any, Callable, List, Mapping
 from dataclasses import dataclass
+from functools import lru_cache, partial
 from pathlib import Path
 import json
+import re
 
+ROOT_DIR = Path(__file__).resolve().parent.parent
+CHALLENGE_DIR = ROOT_DIR / 'challenges'
+TEMPLATE_DIR = ROOT_DIR / 'templates'
 
-@dataclass
+
+@dataclass(frozen=True)
+class ChallengeParts:
+    """Sections of a challenge description used to build prompts"""
+    requirements: str
+    test_cases: str
+    simple_reqs: str
+
+
+@lru_cache(maxsize=32)
+def _load_challenge(challenge_name: str) -> str:
+    """Read a challenge description, cached by challenge name"""
+    with open(CHALLENGE_DIR / f'{challenge_name}.md') as f:
+        return f.read()
+
+
+@lru_cache(maxsize=32)
+def _parsed_challenge(challenge_name: str) -> ChallengeParts:
+    """Extract the prompt-relevant sections of a challenge once per name"""
+    sections = _parse_sections(_load_challenge(challenge_name))
+    requirements = _extract_requirements(sections)
+    return ChallengeParts(
+        requirements=requirements,
+        test_cases=_extract_test_cases(sections),
+        simple_reqs=_simplify_requirements(requirements),
+    )
+
+
+@lru_cache(maxsize=8)
+def _load_template(template_file: str) -> str:
+    """Read a handler template, or return "" if it does not exist"""
+    template_path = TEMPLATE_DIR / template_file
+    if template_path.exists():
+        with open(template_path) as f:
+            return f.read()
+    return ""
+
+
+def _parse_sections(text: str) -> Dict[str, List[str]]:
+    """Split markdown into {heading: lines} in one pass over the text"""
+    sections: Dict[str, List[str]] = {}
+    current = None
+    
+    for line in text.splitlines():
+        if line.startswith('##'):
+            current = line.lstrip('#').strip()
+            sections.setdefault(current, [])
+        elif current is not None:
+            sections[current].append(line)
+            
+    return sections
+
+
+def _extract_requirements(sections: Dict[str, List[str]]) -> str:
+    """Extract requirements section from challenge"""
+    return '\n'.join(line for line in sections.get('Requirements', ()) if line.strip())
+
+
+def _extract_test_cases(sections: Dict[str, List[str]]) -> str:
+    """Extract test cases from challenge"""
+    return '\n'.join(sections.get('Test Cases', ()))
+
+
+_NUMBERED_ITEM = re.compile(r'\s*[1-5]\.')
+
+
+def _simplify_requirements(requirements: str) -> str:
+    """Simplify requirements for small models"""
+    
+    # Extract just the numbered items
+    simple = []
+    for line in requirements.split('\n'):
+        if _NUMBERED_ITEM.match(line):
+            # Remove complex words
+            simplified = line.replace('inherit from', 'use')
+            simplified = simplified.replace('Must', '')
+            simplified = simplified.replace('broadcast', 'send')
+            simple.append(simplified)
+            if len(simple) == 3:  # Limit to 3 main points
+                break
+                
+    return '\n'.join(simple)
+
+
+# Prompt skeletons per model type, filled in with str.format. Fixed
+# instructions come first and the template precedes the challenge text, so
+# prompts for the same model share a long common prefix that the backend can
+# reuse from its prompt cache across retries and levels.
+CODE_PROMPT_TMPL = """Create a Python handler for the Zephyr network.
+
+IMPORTANT:
+- Modify the template below to meet the requirements
+- Keep all imports and base class inheritance
+- Return complete, working Python code
+- Include proper error handling
+
+TEMPLATE TO MODIFY:
+```python
+{template}
+```
+
+REQUIREMENTS:
+{requirements}
+
+TEST CASES:
+{test_cases}
+
+OUTPUT (complete handler code):
+```python"""
+
+REASONING_PROMPT_TMPL = """Let's think step by step to create a Zephyr handler.
+
+STEP 1: Read the template we will modify:
+```python
+{template}
+```
+
+STEP 2: Understand the requirements
+{requirements}
+
+STEP 3: Plan the implementation
+- What state variables do we need?
+- What message types to handle?
+- What responses to return?
+
+STEP 4: Implement the solution
+
+Now, implement the complete handler:
+```python"""
+
+SIMPLE_PROMPT_TMPL = """Fill in the template to create a handler.
+
+TEMPLATE (fill in the marked sections):
+```python
+{template}
+```
+
+WHAT TO DO:
+{requirements}
+
+Complete handler:
+```python"""
+
+# Prompt skeleton per model type, and whether that type gets the
+# simplified requirements and a template with explicit placeholders
+_PROMPT_STYLES = {
+    'code': (CODE_PROMPT_TMPL, False),
+    'reasoning': (REASONING_PROMPT_TMPL, False),
+    'general': (SIMPLE_PROMPT_TMPL, True),
+}
+
+
+def _fill_prompt(skeleton: str, template: str, simplify: bool, parts: ChallengeParts) -> str:
+    """Fill a prompt skeleton with the challenge sections"""
+    return skeleton.format(
+        template=template,
+        requirements=parts.simple_reqs if simplify else parts.requirements,
+        test_cases=parts.test_cases,
+    )
+
+
+@dataclass(frozen=True)
 class PromptStrategy:
     """Strategy for prompting different model types"""
     model_name: str
@@ -18,11 +185,87 @@ class PromptStrategy:
     system_prompt: str
     
     
+@lru_cache(maxsize=64)
+def _fallback_strategy(model_lower: str) -> PromptStrategy:
+    """Create a fallback strategy for unsupported models"""
+    
+    # Determine model type from name heuristics
+    if 'code' in model_lower or 'coder' in model_lower or 'deepseek' in model_lower:
+        model_type = 'code'
+        system_prompt = "You are a Python programmer. Write clean, working code for the Zephyr network handler system."
+        max_tokens = 2048
+    elif 'reason' in model_lower or 'think' in model_lower:
+        model_type = 'reasoning'
+        system_prompt = "Think step by step to create a working Zephyr network handler in Python."
+        max_tokens = 2048
+    else:
+        model_type = 'general'
+        system_prompt = "You are a helpful assistant. Create a Python handler for the Zephyr network following the given template."
+        max_tokens = 1536
+    
+    # Return fallback strategy
+    return PromptStrategy(
+        model_name=model_lower,
+        model_type=model_type,
+        max_tokens=max_tokens,
+        temperature=0.4,  # Conservative temperature for unknown models
+        system_prompt=system_prompt
+    )
+
+
+def _get_template(level: int) -> str:
+    """Get the handler template for a challenge level"""
+    
+    if level == 1:
+        template_file = 'minimal_handler.py'
+    elif level <= 3:
+        template_file = 'stateful_handler.py'
+    else:
+        template_file = 'broadcast_handler.py'
+        
+    return _load_template(template_file)
+
+
+def _add_placeholders(template: str) -> str:
+    """Add clear placeholders for small models"""
+    
+    template = template.replace('YOUR_MESSAGE_TYPE', '### PUT MESSAGE TYPE HERE ###')
+    template = template.replace('YOUR_RESPONSE_TYPE', '### PUT RESPONSE TYPE HERE ###')
+    template = template.replace('# Your response data', '### ADD YOUR DATA HERE ###')
+    template = template.replace('# Initialize any state here', '### ADD VARIABLES HERE (like: self.count = 0) ###')
+    
+    return template
+
+
+@lru_cache(maxsize=64)
+def _specialize(model_lower: str, level: int) -> Callable[[ChallengeParts], str]:
+    """Bind the builder and template for a model and level once.
+    
+    Module level so the cache holds only hashable arguments, never an
+    optimizer instance.
+    """
+    
+    strategy = PromptOptimizer.STRATEGIES.get(model_lower)
+    if not strategy:
+        # Fallback strategy for unsupported models
+        strategy = _fallback_strategy(model_lower)
+        
+    # Load appropriate template
+    template = _get_template(level)
+    
+    # Pick prompt style based on model type
+    skeleton, simplify = _PROMPT_STYLES.get(strategy.model_type, _PROMPT_STYLES['general'])
+    if simplify:
+        template = _add_placeholders(template)
+        
+    return partial(_fill_prompt, skeleton, template, simplify)
+
+
 class PromptOptimizer:
     """Optimize prompts for small language models"""
     
-    # Model-specific strategies
-    STRATEGIES = {
+    # Model-specific strategies, keyed by lowercase model name
+    STRATEGIES: Mapping[str, PromptStrategy] = MappingProxyType({
         'qwen2.5-coder:1.5b': PromptStrategy(
             model_name='qwen2.5-coder:1.5b',
             model_type='code',
@@ -65,249 +308,26 @@ class PromptOptimizer:
             temperature=0.2,
             system_prompt="Think step by step to create a working Zephyr handler."
         )
-    }
+    })
     
     def __init__(self):
-        self.template_dir = Path(__file__).parent.parent / 'templates'
+        self.template_dir = TEMPLATE_DIR
         
     def create_prompt(self, model: str, challenge: str, level: int) -> str:
         """Create optimized prompt for model and challenge"""
         
-        strategy = self.STRATEGIES.get(model)
-        if not strategy:
-            # Fallback strategy for unsupported models
-            strategy = self._get_fallback_strategy(model)
-            
-        # Load challenge description
-        challenge_path = Path(__file__).parent.parent / 'challenges' / f'{challenge}.md'
-        with open(challenge_path) as f:
-            challenge_desc = f.read()
-            
-        # Load appropriate template
-        template = self._get_template(level, strategy.model_type)
+        # Challenge sections and the per-model builder are both cached
+        build = _specialize(model.lower(), level)
+        return build(_parsed_challenge(challenge))
         
-        # Build prompt based on model type
-        if strategy.model_type == 'code':
-            return self._build_code_prompt(challenge_desc, template, level)
-        elif strategy.model_type == 'reasoning':
-            return self._build_reasoning_prompt(challenge_desc, template, level)
-        else:
-            return self._build_simple_prompt(challenge_desc, template, level)
-            
     def _get_template(self, level: int, model_type: str) -> str:
         """Get appropriate template for level and model type"""
-        
-        if level == 1:
-            template_file = 'minimal_handler.py'
-        elif level <= 3:
-            template_file = 'stateful_handler.py'
-        else:
-            template_file = 'broadcast_handler.py'
-            
-        template_path = self.template_dir / template_file
-        if template_path.exists():
-            with open(template_path) as f:
-                return f.read()
-        return ""
-        
-    def _build_code_prompt(self, challenge: str, template: str, level: int) -> str:
-        """Build prompt for code-specialized models"""
-        
-        # Extract key information from challenge
-        requirements = self._extract_requirements(challenge)
-        test_cases = self._extract_test_cases(challenge)
-        
-        prompt = f"""Create a Python handler for the Zephyr network.
-
-TEMPLATE TO MODIFY:
-```python
-{template}
-```
-
-REQUIREMENTS:
-{requirements}
-
-TEST CASES:
-{test_cases}
-
-IMPORTANT:
-- Modify the template above to meet the requirements
-- Keep all imports and base class inheritance
-- Return complete, working Python code
-- Include proper error handling
-
-OUTPUT (complete handler code):
-```python"""
-        
-        return prompt
-        
-    def _build_reasoning_prompt(self, challenge: str, template: str, level: int) -> str:
-        """Build prompt for reasoning models"""
-        
-        requirements = self._extract_requirements(challenge)
-        
-        prompt = f"""Let's think step by step to create a Zephyr handler.
-
-STEP 1: Understand the requirements
-{requirements}
-
-STEP 2: Identify what needs to be modified in this template:
-```python
-{template}
-```
-
-STEP 3: Plan the implementation
-- What state variables do we need?
-- What message types to handle?
-- What responses to return?
-
-STEP 4: Implement the solution
-
-Now, implement the complete handler:
-```python"""
-        
-        return prompt
-        
-    def _build_simple_prompt(self, challenge: str, template: str, level: int) -> str:
-        """Build prompt for small general models"""
-        
-        # Simplify requirements
-        simple_reqs = self._simplify_requirements(challenge)
-        
-        prompt = f"""Fill in the template to create a handler.
-
-WHAT TO DO:
-{simple_reqs}
-
-TEMPLATE (fill in the marked sections):
-```python
-{self._add_placeholders(template)}
-```
-
-Complete handler:
-```python"""
-        
-        return prompt
-        
-    def _extract_requirements(self, challenge: str) -> str:
-        """Extract requirements section from challenge"""
-        lines = challenge.split('\n')
-        in_requirements = False
-        requirements = []
-        
-        for line in lines:
-            if '## Requirements' in line:
-                in_requirements = True
-                continue
-            elif line.startswith('##') and in_requirements:
-                break
-            elif in_requirements and line.strip():
-                requirements.append(line)
-                
-        return '\n'.join(requirements)
-        
-    def _extract_test_cases(self, challenge: str) -> str:
-        """Extract test cases from challenge"""
-        lines = challenge.split('\n')
-        in_test = False
-        test_cases = []
-        
-        for line in lines:
-            if '## Test Cases' in line:
-                in_test = True
-                continue
-            elif line.startswith('##') and in_test:
-                break
-            elif in_test:
-                test_cases.append(line)
-                
-        return '\n'.join(test_cases)
-        
-    def _simplify_requirements(self, challenge: str) -> str:
-        """Simplify requirements for small models"""
-        requirements = self._extract_requirements(challenge)
-        
-        # Extract just the numbered items
-        simple = []
-        for line in requirements.split('\n'):
-            if line.strip().startswith(('1.', '2.', '3.', '4.', '5.')):
-                # Remove complex words
-                simplified = line.replace('inherit from', 'use')
-                simplified = simplified.replace('Must', '')
-                simplified = simplified.replace('broadcast', 'send')
-                simple.append(simplified)
-                
-        return '\n'.join(simple[:3])  # Limit to 3 main points
+        return _get_template(level)
         
     def _add_placeholders(self, template: str) -> str:
         """Add clear placeholders for small models"""
-        
-        template = template.replace('YOUR_MESSAGE_TYPE', '### PUT MESSAGE TYPE HERE ###')
-        template = template.replace('YOUR_RESPONSE_TYPE', '### PUT RESPONSE TYPE HERE ###')
-        template = template.replace('# Your response data', '### ADD YOUR DATA HERE ###')
-        template = template.replace('# Initialize any state here', '### ADD VARIABLES HERE (like: self.count = 0) ###')
-        
-        return template
+        return _add_placeholders(template)
     
     def _get_fallback_strategy(self, model: str) -> PromptStrategy:
         """Create a fallback strategy for unsupported models"""
-        
-        # Determine model type from name heuristics
-        model_lower = model.lower()
-        if 'code' in model_lower or 'coder' in model_lower or 'deepseek' in model_lower:
-            model_type = 'code'
-            system_prompt = "You are a Python programmer. Write clean, working code for the Zephyr network handler system."
-            max_tokens = 2048
-        elif 'reason' in model_lower or 'think' in model_lower:
-            model_type = 'reasoning'
-            system_prompt = "Think step by step to create a working Zephyr network handler in Python."
-            max_tokens = 2048
-        else:
-            model_type = 'general'
-            system_prompt = "You are a helpful assistant. Create a Python handler for the Zephyr network following the given template."
-            max_tokens = 1536
-        
-        # Return fallback strategy
-        return PromptStrategy(
-            model_name=model,
-            model_type=model_type,
-            max_tokens=max_tokens,
-            temperature=0.4,  # Conservative temperature for unknown models
-            system_prompt=system_prompt
-        )
-    
-    def _build_universal_prompt(self, challenge: str, template: str, level: int) -> str:
-        """Build a universal prompt that works with any model"""
-        
-        requirements = self._extract_requirements(challenge)
-        test_cases = self._extract_test_cases(challenge)
-        
-        prompt = f"""Task: Create a Python handler for the Zephyr network system.
-
-Instructions:
-1. Modify the provided template to meet the requirements
-2. Keep all imports and class structure intact
-3. Focus on implementing the handle() and can_handle() methods
-4. Ensure the code is complete and working
-
-Template to modify:
-```python
-{template}
-```
-
-Requirements to implement:
-{requirements}
-
-Expected behavior (test cases):
-{test_cases}
-
-Rules:
-- Output must be valid Python code
-- Must inherit from base handler class
-- Must handle messages according to requirements
-- Include error handling where appropriate
-
-Generate the complete handler implementation:
-```python"""
-        
-        return prompt
+        return _fallback_strategy(model.lower())
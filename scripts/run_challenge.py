@@ -4,54 +4,138 @@ Main test runner for Blossom LLM handler generation with verbose output
 """
 
 import asyncio
+import atexit
 import json
-import sys
 import os
+import re
 import logging
+import queue
+import random
+import shutil
 import time
+from contextlib import contextmanager, nullcontext
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
+import anthropic
 import click
-import ollama
+import httpx
 from dotenv import load_dotenv
 from rich.console import Console
 from rich.table import Table
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeElapsedColumn
 from rich.panel import Panel
-from rich.syntax import Syntax
 
-# Configure logging
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+# Configure logging. Records are queued and written by a listener thread,
+# so concurrent challenges never block on console or disk I/O.
+_log_handlers = [
+    logging.FileHandler(ROOT_DIR / 'logs' / f'challenge_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'),
+    logging.StreamHandler()
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+_log_queue = queue.SimpleQueue()
+_queue_handler = QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
 logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(Path(__file__).parent.parent / 'logs' / f'challenge_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'),
-        logging.StreamHandler()
-    ]
+    level=os.getenv('LOG_LEVEL', 'INFO').upper(),
+    handlers=[_queue_handler]
 )
+_log_listener = QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger('ChallengeRunner')
 console = Console()
 
-# Add parent paths
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+# Challenge names indexed by level (level 0 is unused)
+_CHALLENGE_NAMES = ('unknown', 'echo', 'counter', 'collector', 'executor', 'sync')
+
+# Fenced block tagged python/py (any case); an unterminated block runs to the end
+_CODE_BLOCK_RE = re.compile(r"```(?:python|py)\b(.*?)(?:```|\Z)", re.DOTALL | re.IGNORECASE)
 
 from prompt_optimizer import PromptOptimizer
 from evaluate_handler import HandlerEvaluator
-from model_client import ModelClient
+from model_client import ModelClient, ConfigurationError
+import llm_cache
+
+
+# Connection failures and timeouts from the Ollama (httpx) and Anthropic
+# clients; neither derives from the builtin ConnectionError
+_TRANSIENT_ERRORS = (
+    asyncio.TimeoutError,
+    ConnectionError,
+    httpx.TransportError,
+    anthropic.APIConnectionError,
+)
+
+
+def _is_transient_error(error: Exception) -> bool:
+    """Timeouts, connection failures and 429/5xx responses are worth retrying"""
+    if isinstance(error, _TRANSIENT_ERRORS):
+        return True
+    status = getattr(error, 'status_code', None)
+    return isinstance(status, int) and (status == 429 or status >= 500)
+
+
+def _is_fatal_error(error: Exception) -> bool:
+    """Missing configuration, auth failures and unknown models fail every attempt"""
+    if isinstance(error, ConfigurationError):
+        return True
+    return getattr(error, 'status_code', None) in (401, 403, 404)
+
+
+def _syntax(code: str, lexer: str):
+    """Highlight code for a preview panel.
+    
+    rich.syntax pulls in Pygments, so it is only imported once a verbose
+    preview is actually shown.
+    """
+    from rich.syntax import Syntax
+    return Syntax(code, lexer, theme="monokai")
 
 
 class ChallengeRunner:
     """Run handler generation challenges with detailed output"""
     
-    def __init__(self, verbose=True):
+    def __init__(self, verbose=True, use_llm_cache=None):
         load_dotenv()
         self.verbose = verbose
+        # Replay cached responses; defaults to BLOSSOM_LLM_CACHE
+        self.use_llm_cache = llm_cache.cache_enabled() if use_llm_cache is None else use_llm_cache
         self.prompt_optimizer = PromptOptimizer()
+        # Every attempt at a (model, challenge, level) sends the same prompt
+        self._prompts: Dict[Tuple[str, str, int], str] = {}
         self.evaluator = HandlerEvaluator(verbose=verbose)
         self.model_client = ModelClient()
-        self.output_dir = Path(__file__).parent.parent / 'generated'
-        self.results_file = Path(__file__).parent.parent / 'evaluation' / 'results.json'
+        self.output_dir = ROOT_DIR / 'generated'
+        self.results_file = ROOT_DIR / 'evaluation' / 'results.jsonl'
+        
+        # Challenge levels run concurrently per model; models run one at a
+        # time by default since they usually share a single Ollama server
+        self.level_concurrency = max(1, int(os.getenv('BLOSSOM_PARALLEL', '2')))
+        self.model_concurrency = max(1, int(os.getenv('BLOSSOM_MODEL_PARALLEL', '1')))
+        self.attempt_concurrency = max(1, int(os.getenv('BLOSSOM_PARALLEL_ATTEMPTS', '3')))
+        # Per-call generation timeout and retries for transient failures
+        self.generation_timeout = float(os.getenv('OLLAMA_TIMEOUT', '120'))
+        self.generation_retries = max(0, int(os.getenv('BLOSSOM_GENERATION_RETRIES', '2')))
+        self._live_busy = False
+        self._results_lock = asyncio.Lock()
+        # In-flight generations by cache key, and how many callers await each
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._inflight_waiters: Dict[str, int] = {}
         
         logger.info(f"ChallengeRunner initialized")
         logger.debug(f"Output directory: {self.output_dir}")
@@ -65,11 +149,12 @@ class ChallengeRunner:
         self, 
         model: str, 
         level: int,
-        max_retries: int = 3
+        max_retries: int = 3,
+        save: bool = True
     ) -> Dict[str, Any]:
         """Run a single challenge for a model"""
         
-        challenge_name = f"level{level}_{self._get_challenge_name(level)}"
+        challenge_name = f"level{level}_{self.get_challenge_name(level)}"
         
         # Display challenge header
         console.print(Panel.fit(
@@ -91,122 +176,47 @@ class ChallengeRunner:
         best_handler = None
         attempts = []
         
-        for attempt in range(max_retries):
-            attempt_start = time.time()
-            
-            console.print(f"\n[bold yellow]🎯 Attempt {attempt + 1}/{max_retries}[/bold yellow]")
-            console.print("-" * 50)
-            
-            logger.info(f"Starting attempt {attempt + 1}/{max_retries}")
-            
-            try:
-                # Generate prompt
-                with console.status("[bold green]Creating optimized prompt...") as status:
-                    prompt = self.prompt_optimizer.create_prompt(model, challenge_name, level)
-                    logger.debug(f"Prompt length: {len(prompt)} characters")
-                    if self.verbose:
-                        console.print(Panel(
-                            Syntax(prompt[:500] + "..." if len(prompt) > 500 else prompt, "text", theme="monokai"),
-                            title="Prompt Preview",
-                            border_style="dim"
-                        ))
-                
-                # Generate handler code
-                console.print("[bold cyan]🤖 Generating handler code...[/bold cyan]")
-                generation_start = time.time()
-                
-                with Progress(
-                    SpinnerColumn(),
-                    TextColumn("[progress.description]{task.description}"),
-                    BarColumn(),
-                    TimeElapsedColumn(),
-                    console=console,
-                    transient=True
-                ) as progress:
-                    task = progress.add_task("Waiting for LLM response...", total=None)
-                    handler_code = await self.model_client.generate(model, prompt)
-                    progress.update(task, completed=100)
-                
-                generation_time = time.time() - generation_start
-                logger.info(f"Code generation completed in {generation_time:.2f}s")
-                console.print(f"[green]✓[/green] Generated in {generation_time:.2f}s")
-                
-                # Extract code from response
-                handler_code = self._extract_code(handler_code)
-                logger.debug(f"Extracted {len(handler_code)} characters of code")
-                
-                # Display code preview if verbose
-                if self.verbose:
-                    console.print(Panel(
-                        Syntax(handler_code[:1000] + "..." if len(handler_code) > 1000 else handler_code, "python", theme="monokai"),
-                        title="Generated Code Preview",
-                        border_style="dim"
-                    ))
-                
-                # Save generated handler
-                handler_path = model_dir / f'handler_attempt{attempt + 1}.py'
-                with open(handler_path, 'w') as f:
-                    f.write(handler_code)
-                console.print(f"[green]✓[/green] Saved to {handler_path.relative_to(self.output_dir.parent)}")
-                logger.info(f"Handler saved to {handler_path}")
-                
-                # Evaluate handler
-                console.print("\n[bold magenta]🧪 Evaluating handler...[/bold magenta]")
-                eval_start = time.time()
-                
-                score = await self.evaluator.evaluate(handler_path, level)
-                
-                eval_time = time.time() - eval_start
-                logger.info(f"Evaluation completed in {eval_time:.2f}s with score {score}/100")
-                
-                attempts.append({
-                    'attempt': attempt + 1,
-                    'score': score,
-                    'path': str(handler_path)
-                })
-                
-                # Display score with visual indicator
-                attempt_time = time.time() - attempt_start
-                
-                score_color = "green" if score >= 70 else "yellow" if score >= 40 else "red"
-                score_emoji = "🏆" if score >= 70 else "📈" if score >= 40 else "📉"
+        # Attempts are independent samples, so they run concurrently (bounded
+        # by BLOSSOM_PARALLEL_ATTEMPTS) and the rest are cancelled on a pass
+        semaphore = asyncio.Semaphore(self.attempt_concurrency)
+        
+        async def run_attempt(attempt: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._run_attempt(model, challenge_name, level, attempt, max_retries, model_dir)
                 
-                console.print(Panel(
-                    f"[bold {score_color}]{score_emoji} Score: {score}/100[/bold {score_color}]\n"
-                    f"[dim]Time: {attempt_time:.2f}s[/dim]",
-                    title="Attempt Result",
-                    border_style=score_color
-                ))
+        tasks = [asyncio.create_task(run_attempt(attempt)) for attempt in range(max_retries)]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                att = await finished
+                attempts.append(att)
+                score = att['score']
                 
                 if score > best_score:
                     best_score = score
-                    best_handler = handler_path
+                    best_handler = Path(att['path'])
                     console.print(f"[bold green]🆙 New best score![/bold green]")
                     
                 # If we got a good score, stop retrying
                 if score >= 70:
                     console.print(f"[bold green]✅ PASSED with score {score}![/bold green]")
                     break
-                elif attempt < max_retries - 1:
+                elif att.get('fatal'):
+                    # Other attempts would fail the same way (bad config, missing model)
+                    console.print(f"[bold red]⛔ Stopping: {att['error']}[/bold red]")
+                    break
+                elif len(attempts) < max_retries:
                     console.print(f"[yellow]🔄 Score below threshold (70), retrying...[/yellow]")
-                    
-            except Exception as e:
-                logger.error(f"Attempt {attempt + 1} failed: {e}", exc_info=True)
-                console.print(f"[bold red]❌ Error: {e}[/bold red]")
-                attempts.append({
-                    'attempt': attempt + 1,
-                    'score': 0,
-                    'error': str(e),
-                    'time': time.time() - attempt_start
-                })
-                
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            
+        attempts.sort(key=lambda att: att['attempt'])
+        
         # Save best handler as main
         if best_handler:
             final_path = model_dir / 'handler.py'
-            with open(best_handler) as f:
-                content = f.read()
-            with open(final_path, 'w') as f:
-                f.write(content)
+            await asyncio.to_thread(self.publish_handler, best_handler, final_path)
                 
         # Display summary table
         if self.verbose:
@@ -243,51 +253,264 @@ class ChallengeRunner:
             'final_handler': str(final_path) if best_handler else None
         }
         
-        self._save_result(result)
+        if save:
+            await self._save_results_async([result])
         logger.info(f"Challenge completed: {challenge_name} - Best score: {best_score}/100")
         
         return result
         
-    def _get_challenge_name(self, level: int) -> str:
+    async def _run_attempt(
+        self,
+        model: str,
+        challenge_name: str,
+        level: int,
+        attempt: int,
+        max_retries: int,
+        model_dir: Path
+    ) -> Dict[str, Any]:
+        """Generate, save and evaluate one handler attempt"""
+        
+        attempt_start = time.time()
+        
+        console.print(f"\n[bold yellow]🎯 Attempt {attempt + 1}/{max_retries}[/bold yellow]")
+        console.print("-" * 50)
+        
+        logger.info(f"Starting attempt {attempt + 1}/{max_retries}")
+        
+        try:
+            # Generate prompt
+            # Skip the status line while another challenge's spinner is live
+            status = nullcontext() if self._live_busy else console.status("[bold green]Creating optimized prompt...")
+            with status:
+                prompt = self.create_prompt(model, challenge_name, level)
+                logger.debug(f"Prompt length: {len(prompt)} characters")
+            await self._show_preview(prompt, "text", "Prompt Preview", 500)
+            
+            # Generate handler code
+            console.print("[bold cyan]🤖 Generating handler code...[/bold cyan]")
+            generation_start = time.time()
+            
+            with self._waiting_spinner("Waiting for LLM response..."):
+                handler_code = await self.generate(model, prompt, attempt)
+            
+            generation_time = time.time() - generation_start
+            logger.info(f"Code generation completed in {generation_time:.2f}s")
+            console.print(f"[green]✓[/green] Generated in {generation_time:.2f}s")
+            
+            # Extract code from response
+            handler_code = self.extract_code(handler_code)
+            logger.debug(f"Extracted {len(handler_code)} characters of code")
+            
+            # Display code preview if verbose
+            await self._show_preview(handler_code, "python", "Generated Code Preview", 1000)
+            
+            # Save generated handler
+            handler_path = model_dir / f'handler_attempt{attempt + 1}.py'
+            await asyncio.to_thread(handler_path.write_text, handler_code)
+            console.print(f"[green]✓[/green] Saved to {handler_path.relative_to(self.output_dir.parent)}")
+            logger.info(f"Handler saved to {handler_path}")
+            
+            # Evaluate handler
+            console.print("\n[bold magenta]🧪 Evaluating handler...[/bold magenta]")
+            eval_start = time.time()
+            
+            score = await self.evaluator.evaluate(handler_path, level)
+            
+            eval_time = time.time() - eval_start
+            logger.info(f"Evaluation completed in {eval_time:.2f}s with score {score}/100")
+            
+            # Display score with visual indicator
+            attempt_time = time.time() - attempt_start
+            
+            score_color = "green" if score >= 70 else "yellow" if score >= 40 else "red"
+            score_emoji = "🏆" if score >= 70 else "📈" if score >= 40 else "📉"
+            
+            console.print(Panel(
+                f"[bold {score_color}]{score_emoji} Score: {score}/100[/bold {score_color}]\n"
+                f"[dim]Time: {attempt_time:.2f}s[/dim]",
+                title="Attempt Result",
+                border_style=score_color
+            ))
+            
+            return {
+                'attempt': attempt + 1,
+                'score': score,
+                'path': str(handler_path)
+            }
+            
+        except Exception as e:
+            logger.error(f"Attempt {attempt + 1} failed: {e}", exc_info=True)
+            console.print(f"[bold red]❌ Error: {e}[/bold red]")
+            result = {
+                'attempt': attempt + 1,
+                'score': 0,
+                'error': str(e),
+                'time': time.time() - attempt_start
+            }
+            if _is_fatal_error(e):
+                result['fatal'] = True
+            return result
+                
+    def create_prompt(self, model: str, challenge_name: str, level: int) -> str:
+        """Build the prompt for a challenge, reusing it across attempts"""
+        key = (model, challenge_name, level)
+        prompt = self._prompts.get(key)
+        if prompt is None:
+            prompt = self._prompts[key] = self.prompt_optimizer.create_prompt(model, challenge_name, level)
+        return prompt
+        
+    @staticmethod
+    def publish_handler(best_handler: Path, final_path: Path):
+        """Copy the best attempt over handler.py atomically"""
+        
+        tmp_path = final_path.with_suffix('.tmp')
+        shutil.copyfile(best_handler, tmp_path)
+        os.replace(tmp_path, final_path)
+        
+    async def _show_preview(self, text: str, lexer: str, title: str, limit: int):
+        """Print a highlighted preview panel when verbose on a terminal.
+        
+        Highlighting happens while printing, so that runs in a worker thread
+        to keep concurrent challenges moving.
+        """
+        if not (self.verbose and console.is_terminal):
+            return
+        panel = Panel(
+            _syntax(text[:limit] + "..." if len(text) > limit else text, lexer),
+            title=title,
+            border_style="dim"
+        )
+        await asyncio.to_thread(console.print, panel)
+        
+    async def generate(self, model: str, prompt: str, attempt: int) -> str:
+        """Generate with a timeout, retrying transient failures with backoff"""
+        
+        for retry in range(self.generation_retries + 1):
+            try:
+                return await asyncio.wait_for(
+                    self._generate(model, prompt, attempt),
+                    timeout=self.generation_timeout
+                )
+            except Exception as e:
+                if retry == self.generation_retries or not _is_transient_error(e):
+                    raise
+                delay = 2 ** retry + random.random()
+                logger.warning(f"Generation for attempt {attempt + 1} failed ({e!r}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                
+    async def _generate(self, model: str, prompt: str, attempt: int) -> str:
+        """Generate a response, sharing one call between identical requests.
+        
+        Concurrent callers with the same model, prompt and attempt (e.g. a
+        model listed twice) await the same task. The task is cancelled only
+        once every caller waiting on it has been cancelled.
+        """
+        
+        key = llm_cache.cache_key(model, prompt, attempt)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._generate_once(key, model, prompt, attempt))
+            self._inflight[key] = task
+            self._inflight_waiters[key] = 0
+            task.add_done_callback(lambda _: self._forget_flight(key))
+            
+        self._inflight_waiters[key] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if self._inflight.get(key) is task:
+                self._inflight_waiters[key] -= 1
+                if self._inflight_waiters[key] == 0 and not task.done():
+                    task.cancel()
+                    
+    def _forget_flight(self, key: str):
+        self._inflight.pop(key, None)
+        self._inflight_waiters.pop(key, None)
+        
+    async def _generate_once(self, key: str, model: str, prompt: str, attempt: int) -> str:
+        """Generate a response, replaying it from the LLM cache when enabled"""
+        
+        if not self.use_llm_cache:
+            return await self.model_client.generate(model, prompt, stop_after_code=True, seed=attempt)
+            
+        response = await asyncio.to_thread(llm_cache.load, key)
+        if response is not None:
+            logger.info(f"Using cached response for {model} (attempt {attempt + 1})")
+            return response
+            
+        response = await self.model_client.generate(model, prompt, stop_after_code=True, seed=attempt)
+        await asyncio.to_thread(llm_cache.store, key, response)
+        return response
+        
+    def get_challenge_name(self, level: int) -> str:
         """Get challenge name for level"""
-        names = {
-            1: 'echo',
-            2: 'counter',
-            3: 'collector',
-            4: 'executor',
-            5: 'sync'
-        }
-        return names.get(level, 'unknown')
+        if 0 < level < len(_CHALLENGE_NAMES):
+            return _CHALLENGE_NAMES[level]
+        return 'unknown'
         
-    def _extract_code(self, response: str) -> str:
+    def extract_code(self, response: str) -> str:
         """Extract Python code from model response"""
         
         # Look for code blocks
-        if '```python' in response:
-            start = response.find('```python') + 9
-            end = response.find('```', start)
-            if end > start:
-                return response[start:end].strip()
-                
+        match = _CODE_BLOCK_RE.search(response)
+        if match:
+            return match.group(1).strip()
+            
+        # The prompt ends with an opening fence, so an untagged response is
+        # code up to its closing fence, unless it opens a bare fence itself
+        code, fence, rest = response.partition('```')
+        if fence and not code.strip():
+            code = rest.partition('```')[0]
+            
         # If no code blocks, assume entire response is code
-        return response.strip()
+        return code.strip()
         
-    def _save_result(self, result: Dict[str, Any]):
-        """Save result to results file"""
+    @contextmanager
+    def _waiting_spinner(self, description: str):
+        """Show a transient spinner while awaiting, unless one is already shown.
         
-        # Load existing results
-        if self.results_file.exists():
-            with open(self.results_file) as f:
-                results = json.load(f)
-        else:
-            results = []
+        Rich allows a single live display at a time, so when challenges run
+        concurrently only the first waiter gets a spinner.
+        """
+        if self._live_busy:
+            yield
+            return
+            
+        self._live_busy = True
+        try:
+            with Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                BarColumn(),
+                TimeElapsedColumn(),
+                console=console,
+                transient=True
+            ) as progress:
+                task = progress.add_task(description, total=None)
+                yield
+                progress.update(task, completed=100)
+        finally:
+            self._live_busy = False
+            
+    async def _save_results_async(self, new_results: List[Dict[str, Any]]):
+        """Append results from a worker thread, one writer at a time"""
+        
+        async with self._results_lock:
+            await asyncio.to_thread(self._save_results, new_results)
+            
+    def _save_results(self, new_results: List[Dict[str, Any]]):
+        """Append results to results file, one JSON record per line"""
+        
+        with open(self.results_file, 'ab') as f:
+            f.writelines(_json_dumps(result) + b'\n' for result in new_results)
             
-        # Add new result
-        results.append(result)
+    def load_results(self) -> List[Dict[str, Any]]:
+        """Load all recorded results"""
         
-        # Save
-        with open(self.results_file, 'w') as f:
-            json.dump(results, f, indent=2)
+        if not self.results_file.exists():
+            return []
+        with open(self.results_file, 'rb') as f:
+            return [_json_loads(line) for line in f if line.strip()]
             
     async def run_all_challenges(self, model: str):
         """Run all challenge levels for a model"""
@@ -300,10 +523,14 @@ class ChallengeRunner:
         
         logger.info(f"Starting full test suite for model: {model}")
         
-        results = []
-        for level in range(1, 6):
-            result = await self.run_challenge(model, level)
-            results.append(result)
+        semaphore = asyncio.Semaphore(self.level_concurrency)
+        
+        async def run_level(level: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.run_challenge(model, level, save=False)
+                
+        results = await asyncio.gather(*(run_level(level) for level in range(1, 6)))
+        await self._save_results_async(results)
             
         # Create summary table
         total_score = sum(r['best_score'] for r in results)
@@ -368,9 +595,14 @@ class ChallengeRunner:
             
         print(f"\n🤖 Testing {len(models)} models")
         
-        all_results = {}
-        for model in models:
-            all_results[model] = await self.run_all_challenges(model)
+        semaphore = asyncio.Semaphore(self.model_concurrency)
+        
+        async def run_model(model: str) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self.run_all_challenges(model)
+                
+        model_results = await asyncio.gather(*(run_model(model) for model in models))
+        all_results = dict(zip(models, model_results))
             
         # Final summary
         print("\n" + "="*60)
@@ -394,7 +626,8 @@ class ChallengeRunner:
 @click.option('--all-levels', is_flag=True, help='Run all challenge levels')
 @click.option('--verbose/--quiet', default=True, help='Verbose output mode')
 @click.option('--max-retries', type=int, default=3, help='Maximum retry attempts per challenge')
-def main(model, level, all_models, all_levels, verbose, max_retries):
+@click.option('--llm-cache/--no-llm-cache', 'use_llm_cache', default=None, help='Replay cached model responses (default: BLOSSOM_LLM_CACHE)')
+def main(model, level, all_models, all_levels, verbose, max_retries, use_llm_cache):
     """Run Blossom handler generation challenges with detailed output"""
     
     console.print(Panel.fit(
@@ -404,7 +637,7 @@ def main(model, level, all_models, all_levels, verbose, max_retries):
         border_style="bright_magenta"
     ))
     
-    runner = ChallengeRunner(verbose=verbose)
+    runner = ChallengeRunner(verbose=verbose, use_llm_cache=use_llm_cache)
     
     if all_models:
         asyncio.run(runner.run_all_models())
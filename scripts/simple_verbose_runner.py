@@ -4,13 +4,17 @@ Simple text-only verbose test runner for slower systems
 """
 
 import asyncio
+import io
+import itertools
+import logging
 import sys
 import os
 import json
 import time
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Set, Tuple
 import click
 from dotenv import load_dotenv
 
@@ -21,24 +25,68 @@ from prompt_optimizer import PromptOptimizer
 from evaluate_handler import HandlerEvaluator
 from model_client import ModelClient
 
+# Challenge names indexed by level (level 0 is unused), as in run_challenge.py
+_CHALLENGE_NAMES = ('unknown', 'echo', 'counter', 'collector', 'executor', 'sync')
+
+# Right-aligned level labels, padded once instead of on every log line
+_LEVEL_PAD = {
+    level: f"{level:>7}"
+    for level in (
+        "INFO", "DEBUG", "START", "ATTEMPT", "STEP", "TIME", "CODE", "SAVE",
+        "RESULT", "SUCCESS", "WARNING", "ERROR", "TRACE", "SUMMARY",
+        "PROGRESS", "FINAL", "STATS",
+    )
+}
+
+# Runner levels that map onto real logging levels; everything else is INFO
+_LEVEL_MAP = {
+    "DEBUG": logging.DEBUG,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "TRACE": logging.ERROR,
+}
+
 
 class SimpleVerboseRunner:
     """Simple text-based verbose test runner"""
     
+    # Directories already created by any runner in this process
+    _ensured_dirs: Set[Path] = set()
+    
     def __init__(self, verbose=True):
         load_dotenv()
         self.verbose = verbose
         self.prompt_optimizer = PromptOptimizer()
+        # Every attempt at a (model, challenge, level) sends the same prompt
+        self._prompts: Dict[Tuple[str, str, int], str] = {}
         self.evaluator = HandlerEvaluator(verbose=True)
         self.model_client = ModelClient(verbose=True)
         self.output_dir = Path(__file__).parent.parent / 'generated'
-        self.results_file = Path(__file__).parent.parent / 'evaluation' / 'results.json'
+        self.results_file = Path(__file__).parent.parent / 'evaluation' / 'results.jsonl'
         self.log_file = Path(__file__).parent.parent / 'logs' / f'simple_verbose_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'
         
         # Ensure directories exist
-        self.output_dir.mkdir(parents=True, exist_ok=True)
-        self.results_file.parent.mkdir(parents=True, exist_ok=True)
-        self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(self.output_dir)
+        self._ensure_dir(self.results_file.parent)
+        self._ensure_dir(self.log_file.parent)
+        
+        # One logger fans each line out to the log file and the console; the
+        # handlers keep their streams open and DEBUG is dropped when quiet
+        self._logger = logging.getLogger(f'SimpleVerboseRunner.{id(self)}')
+        self._logger.propagate = False
+        self._logger.setLevel(logging.DEBUG if verbose else logging.INFO)
+        self._logger.addHandler(logging.FileHandler(self.log_file))
+        self._logger.addHandler(logging.StreamHandler(sys.stdout))
+        # (second, "HH:MM:SS") of the last log line
+        self._ts_cache = (0, "")
+        
+        # Concurrency limits, shared with run_challenge.py
+        self.level_concurrency = max(1, int(os.getenv('BLOSSOM_PARALLEL', '2')))
+        self.attempt_concurrency = max(1, int(os.getenv('BLOSSOM_PARALLEL_ATTEMPTS', '3')))
+        # Levels x attempts can exceed what the server should see at once,
+        # so every generate call also holds a slot from this shared window
+        self.generation_semaphore = asyncio.Semaphore(max(1, int(os.getenv('BLOSSOM_MAX_INFLIGHT', '4'))))
+        self._results_lock = asyncio.Lock()
         
         # Track statistics
         self.stats = {
@@ -49,24 +97,30 @@ class SimpleVerboseRunner:
             'scores': []
         }
     
+    def _ensure_dir(self, path: Path):
+        """Create a directory once; later calls skip the mkdir syscalls"""
+        if path not in self._ensured_dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(path)
+    
     def log(self, message: str, level: str = "INFO"):
         """Simple logging to both console and file"""
-        timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-        formatted = f"[{timestamp}] [{level:>7}] {message}"
-        
-        # Console output
-        print(formatted)
-        
-        # File output
-        with open(self.log_file, 'a') as f:
-            f.write(formatted + '\n')
+        log_level = _LEVEL_MAP.get(level, logging.INFO)
+        if not self._logger.isEnabledFor(log_level):
+            return
+        
+        # strftime only runs when the wall-clock second changes
+        now = time.time()
+        sec = int(now)
+        if sec != self._ts_cache[0]:
+            self._ts_cache = (sec, time.strftime("%H:%M:%S", time.localtime(sec)))
+        timestamp = f"{self._ts_cache[1]}.{int((now - sec) * 1000):03d}"
+        formatted = f"[{timestamp}] [{_LEVEL_PAD.get(level) or f'{level:>7}'}] {message}"
+        self._logger.log(log_level, formatted)
     
     def print_separator(self, char: str = "=", length: int = 80):
         """Print a separator line"""
-        line = char * length
-        print(line)
-        with open(self.log_file, 'a') as f:
-            f.write(line + '\n')
+        self._logger.info(char * length)
     
     async def run_challenge(
         self, 
@@ -89,134 +143,54 @@ class SimpleVerboseRunner:
         
         # Create output directory
         model_dir = self.output_dir / model.replace(':', '_') / challenge_name
-        model_dir.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(model_dir)
         self.log(f"Output directory: {model_dir}", "DEBUG")
         
         best_score = 0
         best_handler = None
+        best_code = None
         attempts = []
         
-        for attempt in range(max_retries):
-            attempt_start = time.time()
-            
-            print("")  # Empty line for readability
-            self.log(f"ATTEMPT {attempt + 1}/{max_retries}", "ATTEMPT")
-            self.print_separator("-", 40)
-            
-            try:
-                # Step 1: Generate prompt
-                self.log("Creating optimized prompt...", "STEP")
-                prompt_start = time.time()
-                
-                prompt = self.prompt_optimizer.create_prompt(model, challenge_name, level)
-                
-                prompt_time = time.time() - prompt_start
-                self.log(f"Prompt created in {prompt_time:.2f}s", "TIME")
-                self.log(f"Prompt length: {len(prompt)} characters", "DEBUG")
-                
-                if self.verbose:
-                    self.log("Prompt preview (first 200 chars):", "DEBUG")
-                    preview = prompt[:200] + "..." if len(prompt) > 200 else prompt
-                    for line in preview.split('\n'):
-                        self.log(f"  > {line}", "DEBUG")
-                
-                # Step 2: Generate handler code
-                print("")
-                self.log("Generating handler code from LLM...", "STEP")
-                self.log(f"Sending request to {model}...", "INFO")
-                
-                generation_start = time.time()
-                handler_code = await self.model_client.generate(model, prompt)
-                generation_time = time.time() - generation_start
-                
-                self.log(f"Code generated in {generation_time:.2f}s", "TIME")
-                
-                # Extract code
-                handler_code = self._extract_code(handler_code)
-                self.log(f"Extracted {len(handler_code)} characters of Python code", "INFO")
-                
-                if self.verbose:
-                    lines = handler_code.split('\n')
-                    self.log(f"Code has {len(lines)} lines", "DEBUG")
-                    self.log("Code preview (first 10 lines):", "DEBUG")
-                    for i, line in enumerate(lines[:10], 1):
-                        self.log(f"  {i:3}: {line}", "CODE")
-                
-                # Step 3: Save handler
-                handler_path = model_dir / f'handler_attempt{attempt + 1}.py'
-                with open(handler_path, 'w') as f:
-                    f.write(handler_code)
-                self.log(f"Handler saved to: {handler_path}", "SAVE")
-                
-                # Step 4: Evaluate handler
-                print("")
-                self.log("Starting evaluation...", "STEP")
-                self.print_separator(".", 40)
-                
-                eval_start = time.time()
-                score = await self.evaluator.evaluate(handler_path, level)
-                eval_time = time.time() - eval_start
-                
-                self.log(f"Evaluation completed in {eval_time:.2f}s", "TIME")
-                
-                # Record attempt
-                attempt_time = time.time() - attempt_start
-                attempts.append({
-                    'attempt': attempt + 1,
-                    'score': score,
-                    'time': attempt_time,
-                    'path': str(handler_path)
-                })
-                
-                # Display results
-                print("")
-                self.print_separator("*", 40)
-                self.log(f"SCORE: {score}/100", "RESULT")
-                
-                if score >= 70:
-                    self.log("STATUS: PASSED!", "SUCCESS")
-                elif score >= 40:
-                    self.log("STATUS: PARTIAL", "WARNING")
-                else:
-                    self.log("STATUS: FAILED", "ERROR")
-                
-                self.log(f"Attempt time: {attempt_time:.2f}s", "TIME")
-                self.print_separator("*", 40)
+        # Attempts are independent samples, so they run concurrently (bounded
+        # by BLOSSOM_PARALLEL_ATTEMPTS) and the rest are cancelled on a pass
+        semaphore = asyncio.Semaphore(self.attempt_concurrency)
+        
+        async def run_attempt(attempt: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._run_attempt(model, challenge_name, level, attempt, max_retries, model_dir)
+        
+        tasks = [asyncio.create_task(run_attempt(attempt)) for attempt in range(max_retries)]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                att = await finished
+                # The code stays in memory for publishing, not in the result
+                code = att.pop('code', None)
+                attempts.append(att)
+                score = att['score']
                 
                 if score > best_score:
                     best_score = score
-                    best_handler = handler_path
-                    self.log("New best score!", "INFO")
+                    best_handler = Path(att['path'])
+                    best_code = code
+                    self.log(f"New best score! (attempt {att['attempt']})", "INFO")
                 
                 # Check if we should stop
                 if score >= 70:
                     self.log("Challenge passed! Stopping attempts.", "SUCCESS")
                     break
-                elif attempt < max_retries - 1:
-                    self.log(f"Score below threshold (70). Retrying...", "INFO")
-                    
-            except Exception as e:
-                self.log(f"Error during attempt: {e}", "ERROR")
-                if self.verbose:
-                    import traceback
-                    tb = traceback.format_exc()
-                    for line in tb.split('\n'):
-                        self.log(f"  {line}", "TRACE")
-                
-                attempts.append({
-                    'attempt': attempt + 1,
-                    'score': 0,
-                    'error': str(e),
-                    'time': time.time() - attempt_start
-                })
+                elif len(attempts) < max_retries:
+                    self.log(f"Score below threshold (70). Waiting on remaining attempts...", "INFO")
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        attempts.sort(key=lambda att: att['attempt'])
         
         # Save best handler
         if best_handler:
             final_path = model_dir / 'handler.py'
-            with open(best_handler) as f:
-                content = f.read()
-            with open(final_path, 'w') as f:
-                f.write(content)
+            await asyncio.to_thread(self._write_atomic, final_path, best_code)
             self.log(f"Best handler saved to: {final_path}", "SAVE")
         
         # Summary
@@ -262,42 +236,172 @@ class SimpleVerboseRunner:
             'total_time': total_time
         }
         
-        self._save_result(result)
+        await self._save_result_async(result)
         
         return result
     
+    async def _run_attempt(
+        self,
+        model: str,
+        challenge_name: str,
+        level: int,
+        attempt: int,
+        max_retries: int,
+        model_dir: Path
+    ) -> Dict[str, Any]:
+        """Generate, save and evaluate one attempt"""
+        
+        attempt_start = time.time()
+        # Attempts run concurrently, so tag each line with its attempt
+        tag = f"[{challenge_name} #{attempt + 1}]"
+        
+        print("")  # Empty line for readability
+        self.log(f"{tag} ATTEMPT {attempt + 1}/{max_retries}", "ATTEMPT")
+        self.print_separator("-", 40)
+        
+        try:
+            # Step 1: Generate prompt
+            self.log(f"{tag} Creating optimized prompt...", "STEP")
+            prompt_start = time.time()
+            
+            prompt = self._create_prompt(model, challenge_name, level)
+            
+            prompt_time = time.time() - prompt_start
+            self.log(f"{tag} Prompt created in {prompt_time:.2f}s", "TIME")
+            self.log(f"{tag} Prompt length: {len(prompt)} characters", "DEBUG")
+            
+            if self.verbose:
+                # Multi-line blocks go out as one message: one timestamp, one write
+                preview = prompt[:200] + "..." if len(prompt) > 200 else prompt
+                preview_lines = "\n".join(f"  > {line}" for line in preview.split('\n'))
+                self.log(f"{tag} Prompt preview (first 200 chars):\n{preview_lines}", "DEBUG")
+            
+            # Step 2: Generate handler code
+            print("")
+            self.log(f"{tag} Generating handler code from LLM...", "STEP")
+            self.log(f"{tag} Sending request to {model}...", "INFO")
+            
+            generation_start = time.time()
+            async with self.generation_semaphore:
+                handler_code = await self.model_client.generate(model, prompt)
+            generation_time = time.time() - generation_start
+            
+            self.log(f"{tag} Code generated in {generation_time:.2f}s", "TIME")
+            
+            # Extract code
+            handler_code = self._extract_code(handler_code)
+            self.log(f"{tag} Extracted {len(handler_code)} characters of Python code", "INFO")
+            
+            if self.verbose:
+                # Count lines and read only the previewed ones, without
+                # splitting the whole response into a list
+                line_count = handler_code.count('\n') + 1
+                self.log(f"{tag} Code has {line_count} lines", "DEBUG")
+                head = [line.rstrip('\n') for line in itertools.islice(io.StringIO(handler_code), 10)]
+                code_lines = "\n".join(f"  {i:3}: {line}" for i, line in enumerate(head, 1))
+                self.log(f"{tag} Code preview (first 10 lines):\n{code_lines}", "CODE")
+            
+            # Step 3: Save handler
+            handler_path = model_dir / f'handler_attempt{attempt + 1}.py'
+            await asyncio.to_thread(self._write_atomic, handler_path, handler_code)
+            self.log(f"{tag} Handler saved to: {handler_path}", "SAVE")
+            
+            # Step 4: Evaluate handler
+            print("")
+            self.log(f"{tag} Starting evaluation...", "STEP")
+            self.print_separator(".", 40)
+            
+            eval_start = time.time()
+            score = await self.evaluator.evaluate(handler_path, level)
+            eval_time = time.time() - eval_start
+            
+            self.log(f"{tag} Evaluation completed in {eval_time:.2f}s", "TIME")
+            
+            # Display results
+            attempt_time = time.time() - attempt_start
+            print("")
+            self.print_separator("*", 40)
+            self.log(f"{tag} SCORE: {score}/100", "RESULT")
+            
+            if score >= 70:
+                self.log(f"{tag} STATUS: PASSED!", "SUCCESS")
+            elif score >= 40:
+                self.log(f"{tag} STATUS: PARTIAL", "WARNING")
+            else:
+                self.log(f"{tag} STATUS: FAILED", "ERROR")
+            
+            self.log(f"{tag} Attempt time: {attempt_time:.2f}s", "TIME")
+            self.print_separator("*", 40)
+            
+            return {
+                'attempt': attempt + 1,
+                'score': score,
+                'time': attempt_time,
+                'path': str(handler_path),
+                'code': handler_code
+            }
+        
+        except Exception as e:
+            self.log(f"{tag} Error during attempt: {e}", "ERROR")
+            if self.verbose:
+                import traceback
+                self.log(f"{tag} Traceback:\n{traceback.format_exc().rstrip()}", "TRACE")
+            
+            return {
+                'attempt': attempt + 1,
+                'score': 0,
+                'error': str(e),
+                'time': time.time() - attempt_start
+            }
+    
+    def _create_prompt(self, model: str, challenge_name: str, level: int) -> str:
+        """Build the prompt for a challenge, reusing it across attempts"""
+        key = (model, challenge_name, level)
+        prompt = self._prompts.get(key)
+        if prompt is None:
+            prompt = self._prompts[key] = self.prompt_optimizer.create_prompt(model, challenge_name, level)
+        return prompt
+    
     def _get_challenge_name(self, level: int) -> str:
         """Get challenge name for level"""
-        names = {
-            1: 'echo',
-            2: 'counter',
-            3: 'collector',
-            4: 'executor',
-            5: 'sync'
-        }
-        return names.get(level, 'unknown')
+        if 0 < level < len(_CHALLENGE_NAMES):
+            return _CHALLENGE_NAMES[level]
+        return 'unknown'
     
-    def _extract_code(self, response: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _extract_code(response: str) -> str:
         """Extract Python code from model response"""
-        if '```python' in response:
-            start = response.find('```python') + 9
-            end = response.find('```', start)
-            if end > start:
-                return response[start:end].strip()
+        _, fence, rest = response.partition('```python')
+        if fence:
+            code, closing, _ = rest.partition('```')
+            if closing and code:
+                return code.strip()
         return response.strip()
     
+    @staticmethod
+    def _write_atomic(path: Path, text: str):
+        """Replace a file in one step, as run_challenge publishes handler.py"""
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_text(text)
+        os.replace(tmp_path, path)
+    
+    async def _save_result_async(self, result: Dict[str, Any]):
+        """Append a result from a worker thread, one writer at a time"""
+        async with self._results_lock:
+            await asyncio.to_thread(self._save_result, result)
+    
     def _save_result(self, result: Dict[str, Any]):
-        """Save result to results file"""
-        if self.results_file.exists():
-            with open(self.results_file) as f:
-                results = json.load(f)
-        else:
-            results = []
-        
-        results.append(result)
-        
-        with open(self.results_file, 'w') as f:
-            json.dump(results, f, indent=2)
+        """Append result to results file, one JSON record per line"""
+        with open(self.results_file, 'a') as f:
+            f.write(json.dumps(result) + '\n')
+    
+    def load_results(self) -> List[Dict[str, Any]]:
+        """Load all recorded results"""
+        if not self.results_file.exists():
+            return []
+        with open(self.results_file) as f:
+            return [json.loads(line) for line in f if line.strip()]
     
     async def run_all_challenges(self, model: str):
         """Run all challenge levels"""
@@ -310,18 +414,26 @@ class SimpleVerboseRunner:
         self.log(f"Levels: 1-5", "INFO")
         self.print_separator("#", 80)
         
-        results = []
-        for level in range(1, 6):
-            print(f"\n\n")  # Add spacing between challenges
-            result = await self.run_challenge(model, level)
-            results.append(result)
+        # Levels are independent, so they run concurrently (bounded by
+        # BLOSSOM_PARALLEL) and the inference server can batch the requests
+        semaphore = asyncio.Semaphore(self.level_concurrency)
+        completed = []
+        
+        async def run_level(level: int) -> Dict[str, Any]:
+            async with semaphore:
+                print(f"\n\n")  # Add spacing between challenges
+                result = await self.run_challenge(model, level)
+            completed.append(result)
             
             # Progress update
             print("")
-            self.log(f"Progress: {level}/5 challenges completed", "PROGRESS")
-            current_passed = sum(1 for r in results if r['passed'])
-            self.log(f"Current Status: {current_passed}/{level} passed", "PROGRESS")
+            self.log(f"Progress: {len(completed)}/5 challenges completed", "PROGRESS")
+            current_passed = sum(1 for r in completed if r['passed'])
+            self.log(f"Current Status: {current_passed}/{len(completed)} passed", "PROGRESS")
             print("")
+            return result
+        
+        results = await asyncio.gather(*(run_level(level) for level in range(1, 6)))
         
         # Final summary
         suite_time = time.time() - suite_start
@@ -16,19 +16,36 @@ class BroadcastHandler(HotHandler):
         super().__init__(node)
         # State
         self.broadcast_interval = 30  # seconds
-        self.last_broadcast = 0
+        self.last_broadcast = 0  # loop clock (monotonic), not wall time
+        self.max_batch = 64  # flush early once this many items are queued
+        self.stop_timeout = 5  # seconds deactivate waits for the final flush
+        self._pending = []
+        self._flush_now = asyncio.Event()
+        self._stop = asyncio.Event()
         self._broadcast_task = None
+        self._loop = None
         
     async def activate(self) -> None:
         """Start broadcasting"""
         await super().activate()
+        self._loop = asyncio.get_running_loop()
+        self._stop.clear()
+        self._flush_now.clear()
         # Start broadcast task
         self._broadcast_task = asyncio.create_task(self._broadcast_loop())
         
     async def deactivate(self) -> None:
         """Stop broadcasting"""
+        # Wake the loop so it exits now rather than after the interval
+        self._stop.set()
+        self._flush_now.set()
         if self._broadcast_task:
-            self._broadcast_task.cancel()
+            try:
+                # wait_for cancels the task if a broadcast hangs
+                await asyncio.wait_for(self._broadcast_task, self.stop_timeout)
+            except asyncio.TimeoutError:
+                self.logger.warning("Broadcast loop did not stop in time; cancelled it")
+            self._broadcast_task = None
         await super().deactivate()
         
     async def process(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -44,28 +61,54 @@ class BroadcastHandler(HotHandler):
             
         return None
         
+    def queue_broadcast(self, item: Any) -> None:
+        """Queue an item for the next batched broadcast"""
+        self._pending.append(item)
+        if len(self._pending) >= self.max_batch:
+            self.flush_on_demand()
+            
+    def flush_on_demand(self) -> None:
+        """Send queued items now instead of waiting for the interval"""
+        self._flush_now.set()
+        
     async def _broadcast_loop(self):
-        """Periodic broadcast task"""
+        """Periodic broadcast task; queued items go out as one message"""
         while self._active:
             try:
-                await asyncio.sleep(self.broadcast_interval)
-                
-                # Create broadcast message
-                msg = TransportMessage(
-                    message_type='YOUR_BROADCAST_TYPE',
-                    payload={
-                        'timestamp': time.time(),
-                        'data': 'YOUR_DATA'
-                    },
-                    src_addr=self.node.machine_id,
-                    transport='handler'
-                )
-                
-                # Broadcast
-                await self.node.broadcast(msg)
-                self.last_broadcast = time.time()
+                try:
+                    await asyncio.wait_for(self._flush_now.wait(), self.broadcast_interval)
+                except asyncio.TimeoutError:
+                    pass
+                if self._stop.is_set():
+                    # Send anything still queued once, then exit
+                    if self._pending:
+                        await self._flush()
+                    break
+                self._flush_now.clear()
+                await self._flush()
                 
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                self.logger.error(f"Broadcast error: {e}")
\ No newline at end of file
+                self.logger.error(f"Broadcast error: {e}")
+                
+    async def _flush(self):
+        """Broadcast the queued items as one message"""
+        # Swap out the queue so new items collect for the next batch
+        batch, self._pending = self._pending, []
+        
+        # Create broadcast message
+        msg = TransportMessage(
+            message_type='YOUR_BROADCAST_TYPE',
+            payload={
+                'timestamp': time.time(),
+                'data': 'YOUR_DATA',
+                'items': batch
+            },
+            src_addr=self.node.machine_id,
+            transport='handler'
+        )
+        
+        # Broadcast
+        await self.node.broadcast(msg)
+        self.last_broadcast = self._loop.time()
@@ -4,6 +4,7 @@ Test harness for evaluating LLM-generated code against task specifications.
 Compiles C code, executes programs, and validates output against expected results.
 """
 
+import asyncio
 import os
 import sys
 import yaml
@@ -15,23 +16,81 @@ from typing import Dict, Any, List, Optional, Tuple
 import time
 import json
 from datetime import datetime
+from functools import lru_cache
 
 from ollama_client import MinimalOllamaClient
 
+try:
+    import orjson
+
+    def _dump_results(results: List[Dict[str, Any]]) -> bytes:
+        return orjson.dumps(results, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _dump_results(results: List[Dict[str, Any]]) -> bytes:
+        return json.dumps(results, indent=2).encode()
+
+# Faster event loop for the subprocess and pipe traffic, when installed
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# LibYAML's C loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+@lru_cache(maxsize=128)
+def _load_template_cached(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a task template, memoized by path and modification time."""
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=_YAML_LOADER)
+
+
+async def _run_process(cmd: List[str], stdin_data: bytes = b'', timeout: float = 5) -> Tuple[int, bytes, bytes]:
+    """
+    Run a command to completion without blocking the event loop.
+    Returns (returncode, stdout, stderr); raises subprocess.TimeoutExpired
+    after killing a process that outlives the timeout.
+    """
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(stdin_data), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    return process.returncode, stdout, stderr
+
 
 class TaskHarness:
     """Executes task templates and evaluates generated code."""
     
-    def __init__(self, model: str = "qwen2.5-coder:1.5b", ollama_url: str = "http://localhost:11434"):
+    def __init__(
+        self,
+        model: str = "qwen2.5-coder:1.5b",
+        ollama_url: str = "http://localhost:11434",
+        parallel_generations: int = 2
+    ):
         self.model = model
         self.client = MinimalOllamaClient(ollama_url)
-        self.work_dir = Path(tempfile.mkdtemp(prefix="blossom_"))
+        # Builds and test binaries live on tmpfs when it is available
+        shm_dir = "/dev/shm" if os.access("/dev/shm", os.W_OK) else None
+        self.work_dir = Path(tempfile.mkdtemp(prefix="blossom_", dir=shm_dir))
         self.results = []
         
+        # Each pipeline stage has its own slots, so the model keeps generating
+        # the next template while earlier ones compile and run their tests
+        self._generation_slots = asyncio.Semaphore(max(1, parallel_generations))
+        self._build_slots = asyncio.Semaphore(os.cpu_count() or 1)
+        
     def load_template(self, template_path: Path) -> Dict[str, Any]:
-        """Load a task template from YAML file."""
-        with open(template_path, 'r') as f:
-            return yaml.safe_load(f)
+        """Load a task template from YAML file (shared; do not mutate)."""
+        return _load_template_cached(str(template_path), template_path.stat().st_mtime_ns)
     
     def generate_code(self, template: Dict[str, Any]) -> str:
         """Generate code using the LLM based on template specifications."""
@@ -61,26 +120,22 @@ class TaskHarness:
         
         return code
     
-    def compile_c(self, code: str, template: Dict[str, Any]) -> Optional[Path]:
+    async def compile_c(self, code: str, template: Dict[str, Any]) -> Optional[Path]:
         """Compile C code and return path to executable."""
         build_config = template.get('build', {})
         
-        # Write source file
-        source_file = self.work_dir / f"{template['name']}.c"
-        with open(source_file, 'w') as f:
-            f.write(code)
-        
-        # Compile
+        # Compile, feeding the source on stdin (the generated code is already
+        # saved by evaluate_task) and keeping intermediates in pipes
         output_file = self.work_dir / build_config.get('output', template['name'])
         compiler = build_config.get('compiler', 'gcc')
         flags = build_config.get('flags', ['-O2', '-Wall'])
         
-        cmd = [compiler] + flags + ['-o', str(output_file), str(source_file)]
+        cmd = [compiler] + flags + ['-pipe', '-o', str(output_file), '-x', 'c', '-']
         
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
-            if result.returncode != 0:
-                print(f"Compilation failed:\n{result.stderr}")
+            returncode, _, stderr = await _run_process(cmd, code.encode(), timeout=5)
+            if returncode != 0:
+                print(f"Compilation failed:\n{stderr.decode(errors='replace')}")
                 return None
             return output_file
         except subprocess.TimeoutExpired:
@@ -106,7 +161,7 @@ class TaskHarness:
         script_file.chmod(0o755)
         return script_file
     
-    def run_test(self, executable: Path, test_case: Dict[str, Any]) -> Tuple[bool, str, str]:
+    async def run_test(self, executable: Path, test_case: Dict[str, Any]) -> Tuple[bool, str, str]:
         """
         Run a single test case against the executable.
         Returns (passed, actual_output, error_message).
@@ -116,28 +171,66 @@ class TaskHarness:
         timeout = test_case.get('timeout', 2)
         
         try:
-            result = subprocess.run(
-                [str(executable)],
-                input=stdin_data,
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
+            _, stdout, _ = await _run_process([str(executable)], stdin_data.encode(), timeout)
             
-            actual_output = result.stdout.strip()
-            
-            # Compare outputs
-            if actual_output == expected_stdout:
-                return True, actual_output, None
-            else:
-                return False, actual_output, f"Expected:\n{expected_stdout}\nGot:\n{actual_output}"
+            actual_output = stdout.decode(errors='replace').strip()
+            return self._compare_output(expected_stdout, actual_output)
             
         except subprocess.TimeoutExpired:
             return False, "", f"Test timed out after {timeout} seconds"
         except Exception as e:
             return False, "", f"Runtime error: {e}"
     
-    def evaluate_task(self, template_path: Path) -> Dict[str, Any]:
+    async def run_tests_batched(self, executable: Path, template: Dict[str, Any]) -> List[Tuple[bool, str, str]]:
+        """
+        Run every test case of a template through a single process.
+        Opted into with 'batched_tests: true': the cases' stdin is joined with
+        a batch_delimiter line (default '---') which the program must echo
+        as-is, so its stdout splits back into one segment per case.
+        """
+        tests = template['tests']
+        delimiter = template.get('batch_delimiter', '---')
+        timeout = sum(test_case.get('timeout', 2) for test_case in tests)
+        
+        chunks = []
+        for test_case in tests:
+            stdin_data = test_case.get('stdin', '')
+            if stdin_data and not stdin_data.endswith('\n'):
+                stdin_data += '\n'
+            chunks.append(stdin_data)
+        batched_stdin = f"{delimiter}\n".join(chunks)
+        
+        try:
+            _, stdout, _ = await _run_process([str(executable)], batched_stdin.encode(), timeout)
+        except subprocess.TimeoutExpired:
+            return [(False, "", f"Batched tests timed out after {timeout} seconds")] * len(tests)
+        except Exception as e:
+            return [(False, "", f"Runtime error: {e}")] * len(tests)
+        
+        segments = [[]]
+        for line in stdout.decode(errors='replace').splitlines():
+            if line == delimiter:
+                segments.append([])
+            else:
+                segments[-1].append(line)
+        
+        if len(segments) != len(tests):
+            error = f"Expected {len(tests)} delimited outputs, got {len(segments)}"
+            return [(False, "", error)] * len(tests)
+        
+        return [
+            self._compare_output(test_case.get('expected_stdout', '').strip(), '\n'.join(segment).strip())
+            for test_case, segment in zip(tests, segments)
+        ]
+    
+    @staticmethod
+    def _compare_output(expected_stdout: str, actual_output: str) -> Tuple[bool, str, str]:
+        """Compare stripped outputs; returns (passed, actual_output, error_message)."""
+        if actual_output == expected_stdout:
+            return True, actual_output, None
+        return False, actual_output, f"Expected:\n{expected_stdout}\nGot:\n{actual_output}"
+    
+    async def evaluate_task(self, template_path: Path) -> Dict[str, Any]:
         """
         Complete evaluation pipeline for a single task template.
         """
@@ -152,7 +245,8 @@ class TaskHarness:
         
         # Generate code
         start_time = time.time()
-        code = self.generate_code(template)
+        async with self._generation_slots:
+            code = await asyncio.to_thread(self.generate_code, template)
         generation_time = time.time() - start_time
         
         result['generation_time'] = generation_time
@@ -163,9 +257,14 @@ class TaskHarness:
         with open(code_file, 'w') as f:
             f.write(code)
         
+        async with self._build_slots:
+            return await self._build_and_test(code, template, result)
+    
+    async def _build_and_test(self, code: str, template: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+        """Compile or prepare the generated code and run the template's tests."""
         # Prepare executable
         if template['language'] == 'c':
-            executable = self.compile_c(code, template)
+            executable = await self.compile_c(code, template)
             if not executable:
                 result['compilation_failed'] = True
                 result['tests'] = [{'name': t['name'], 'passed': False, 'error': 'Compilation failed'} 
@@ -179,10 +278,14 @@ class TaskHarness:
             result['success_rate'] = 0
             return result
         
-        # Run tests
-        for test_case in template['tests']:
+        # Run tests, in one process when the template allows it
+        if template.get('batched_tests'):
+            outcomes = await self.run_tests_batched(executable, template)
+        else:
+            outcomes = [await self.run_test(executable, test_case) for test_case in template['tests']]
+        
+        for test_case, (passed, output, error) in zip(template['tests'], outcomes):
             test_result = {'name': test_case['name']}
-            passed, output, error = self.run_test(executable, test_case)
             
             test_result['passed'] = passed
             test_result['output'] = output
@@ -198,18 +301,18 @@ class TaskHarness:
         
         return result
     
-    def run_all_templates(self, template_dir: Path) -> List[Dict[str, Any]]:
+    async def run_all_templates(self, template_dir: Path) -> List[Dict[str, Any]]:
         """Run all templates in a directory."""
-        results = []
+        template_paths = sorted(template_dir.glob("*.yaml"))
         
-        for template_path in sorted(template_dir.glob("*.yaml")):
+        # Templates are independent; evaluate_task bounds each stage itself
+        results = await asyncio.gather(*(self.evaluate_task(path) for path in template_paths))
+        
+        for template_path, result in zip(template_paths, results):
             print(f"\n{'='*60}")
             print(f"Evaluating: {template_path.name}")
             print('='*60)
             
-            result = self.evaluate_task(template_path)
-            results.append(result)
-            
             # Print summary
             print(f"\nResults for {result['name']}:")
             print(f"  Language: {result['language']}")
@@ -222,12 +325,12 @@ class TaskHarness:
                 if not test['passed'] and 'error' in test:
                     print(f"    Error: {test['error'][:100]}")
         
-        return results
+        return list(results)
     
     def save_results(self, results: List[Dict[str, Any]], output_file: Path):
         """Save evaluation results to JSON."""
-        with open(output_file, 'w') as f:
-            json.dump(results, f, indent=2)
+        with open(output_file, 'wb') as f:
+            f.write(_dump_results(results))
         print(f"\nResults saved to: {output_file}")
     
     def cleanup(self):
@@ -247,11 +350,16 @@ def main():
     parser.add_argument("--template-dir", default="task-templates", help="Directory with task templates")
     parser.add_argument("--output", default="results.json", help="Output file for results")
     parser.add_argument("--keep-work-dir", action="store_true", help="Keep temporary work directory")
+    parser.add_argument("--parallel-generations", type=int, default=2, help="Generations in flight while others compile and test")
     
     args = parser.parse_args()
     
     # Initialize harness
-    harness = TaskHarness(model=args.model, ollama_url=args.ollama_url)
+    harness = TaskHarness(
+        model=args.model,
+        ollama_url=args.ollama_url,
+        parallel_generations=args.parallel_generations
+    )
     
     try:
         # Run evaluations
@@ -260,7 +368,9 @@ def main():
             print(f"Template directory not found: {template_dir}")
             sys.exit(1)
         
-        results = harness.run_all_templates(template_dir)
+        if uvloop is not None:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        results = asyncio.run(harness.run_all_templates(template_dir))
         
         # Save results
         harness.save_results(results, Path(args.output))
@@ -0,0 +1,39 @@
+"""
+Tests for the streamed code block detection in model_client
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+for _module in ('ollama', 'anthropic', 'dotenv'):
+    pytest.importorskip(_module)
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from model_client import _code_block_closed
+
+
+@pytest.mark.parametrize('text', [
+    "Here is the handler:\n```python",
+    "Here is the handler:\n```python\nclass Handler:\n    pass\n",
+    "<think>plan the handler</think>\nSure!\n```python",
+    "<think>plan the handler</think>\nSure!\n```python\nclass Handler:\n",
+    "<think>```python\nclass Draft:\n```",
+    "```python\nclass Handler:\n",
+    "",
+])
+def test_open_block_is_not_closed(text):
+    assert not _code_block_closed(text)
+
+
+@pytest.mark.parametrize('text', [
+    "class H:\n    pass\n```\nThis handler...",
+    "Here is the handler:\n```python\nclass Handler:\n    pass\n```",
+    "<think>plan the handler</think>\nSure!\n```python\nclass Handler:\n    pass\n```",
+    "<think>```python\nclass Draft:\n```</think>\n```python\nclass Handler:\n```",
+    "```python\nclass Handler:\n    pass\n```",
+])
+def test_complete_block_is_closed(text):
+    assert _code_block_closed(text)
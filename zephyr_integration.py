@@ -4,18 +4,263 @@ Example integration showing how LLM-generated handlers could be integrated
 with the Zephyr mesh network system.
 """
 
+import hashlib
 import subprocess
-import tempfile
 from pathlib import Path
 from ollama_client import MinimalOllamaClient
 
 
+# Python wrapper source emitted for compiled handlers; filled in per handler
+# with str.format, so literal braces in the generated code are doubled.
+_WRAPPER_TEMPLATE = '''#!/usr/bin/env python3
+"""
+Auto-generated Zephyr handler wrapper.
+Bridges between Python handler system and compiled binary handler.
+"""
+
+import os
+import select
+import subprocess
+import asyncio
+from collections import deque
+from typing import Optional
+
+_NEWLINE = b'\\n'
+_SEP = b' '
+
+# Message types repeat, so each one is encoded once
+_type_bytes = {{}}
+
+
+def _as_bytes(value) -> bytes:
+    """Pass bytes through; encode anything else via str()."""
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode()
+
+
+def _encode_type(msg_type) -> bytes:
+    encoded = _type_bytes.get(msg_type)
+    if encoded is None:
+        encoded = _type_bytes[msg_type] = _as_bytes(msg_type)
+    return encoded
+
+
+class GeneratedHandler:
+    """Handler that delegates to compiled binary.
+    
+    By default one message is in flight at a time: a message the binary
+    filters out (no output line) resolves to None after reply_timeout, and
+    output that arrives while nothing is waiting is dropped as stale. A
+    reply slower than the timeout can still be taken for the next
+    message's answer, so keep reply_timeout above the binary's worst case.
+    
+    Binaries that answer every input line with exactly one output line, in
+    order, can set one_reply_per_line; messages are then pipelined in
+    batches and each output line goes to the oldest unanswered message. A
+    timeout means that contract broke, so the binary is restarted rather
+    than letting later replies shift onto the wrong callers.
+    """
+    
+    one_reply_per_line = {one_reply_per_line}
+    reply_timeout = 1.0
+    # Unflushed bytes allowed before a write waits on drain()
+    drain_threshold = 64 * 1024
+    
+    def __init__(self):
+        self.handler_path = "{handler_path}"
+        self.handler_type = "{handler_type}"
+        self.process = None
+        self._send_q = None
+        self._waiters = deque()
+        self._tasks = []
+        self._start_lock = asyncio.Lock()
+    
+    async def start(self):
+        """Start the handler subprocess and its pipe tasks."""
+        self._reset()
+        self.process = await asyncio.create_subprocess_exec(
+            self.handler_path,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        self._send_q = asyncio.Queue()
+        self._tasks = [
+            asyncio.create_task(self._writer(self.process)),
+            asyncio.create_task(self._reader(self.process)),
+        ]
+    
+    def _running(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+    
+    def _reset(self):
+        """Drop the current process; its pending messages resolve to None."""
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        if self._running():
+            self.process.terminate()
+        self.process = None
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+        if self._send_q is not None:
+            while not self._send_q.empty():
+                _, waiter = self._send_q.get_nowait()
+                if not waiter.done():
+                    waiter.set_result(None)
+    
+    async def handle(self, message: dict) -> Optional[bytes]:
+        """Process a message through the handler.
+        
+        Returns the raw response line without its line ending; callers that
+        need text decode it themselves.
+        """
+        if not self._running():
+            # Concurrent first calls share one startup
+            async with self._start_lock:
+                if not self._running():
+                    await self.start()
+        
+        # Format message for handler as "TYPE DATA\\n", built directly as bytes
+        msg_line = b''.join((
+            _encode_type(message.get('type', 'unknown')),
+            _SEP,
+            _as_bytes(message.get('data', '')),
+            _NEWLINE,
+        ))
+        
+        # Queue for the writer and wait for the matching response; the
+        # writer starts the reply timeout once the line is sent
+        waiter = asyncio.get_running_loop().create_future()
+        self._send_q.put_nowait((msg_line, waiter))
+        return await waiter
+    
+    def _expire(self, waiter):
+        """Answer a message with None once its timeout passes."""
+        if waiter.done():
+            return
+        waiter.set_result(None)
+        if waiter in self._waiters:
+            if self.one_reply_per_line:
+                # Replies no longer line up with the waiting messages
+                self._reset()
+            else:
+                # Filtered out; a late line for it is dropped as stale
+                self._waiters.remove(waiter)
+    
+    async def _writer(self, process):
+        """Write queued messages, one batch per write() when pipelining."""
+        loop = asyncio.get_running_loop()
+        pipe = process.stdin.transport.get_extra_info('pipe')
+        stdin_fd = pipe.fileno() if pipe is not None else None
+        bytes_since_drain = 0
+        while True:
+            batch = []
+            data, waiter = await self._send_q.get()
+            while True:
+                # Messages that already timed out or were cancelled are skipped
+                if not waiter.done():
+                    batch.append(data)
+                    self._waiters.append(waiter)
+                    # A plain timer resolves the future on timeout, so no
+                    # wait_for task per message
+                    timer = loop.call_later(self.reply_timeout, self._expire, waiter)
+                    waiter.add_done_callback(lambda _, timer=timer: timer.cancel())
+                if not self.one_reply_per_line or self._send_q.empty():
+                    break
+                data, waiter = self._send_q.get_nowait()
+            if not batch:
+                continue
+            
+            # write() hands the bytes to the pipe right away; drain() only
+            # matters once the buffer backs up
+            payload = b''.join(batch)
+            try:
+                written = False
+                # A write of at most PIPE_BUF bytes to an idle pipe is atomic,
+                # so small batches skip the transport machinery entirely
+                if (stdin_fd is not None and len(payload) <= select.PIPE_BUF
+                        and not process.stdin.transport.get_write_buffer_size()):
+                    try:
+                        os.write(stdin_fd, payload)
+                        written = True
+                    except BlockingIOError:
+                        pass
+                if not written:
+                    process.stdin.write(payload)
+                    bytes_since_drain += len(payload)
+                    if bytes_since_drain >= self.drain_threshold:
+                        await process.stdin.drain()
+                        bytes_since_drain = 0
+            except (BrokenPipeError, ConnectionResetError):
+                # The binary exited; handle() starts a fresh one
+                if self.process is process:
+                    self._reset()
+                return
+            
+            if not self.one_reply_per_line:
+                # The binary may drop this line, so hold the next message
+                # until it is answered or times out
+                await asyncio.wait((waiter,))
+    
+    async def _reader(self, process):
+        """Resolve the oldest waiting message with each output line."""
+        while True:
+            try:
+                response = await process.stdout.readline()
+            except ValueError:
+                # Reply line over the stream limit; the pipe is out of sync
+                response = b''
+            if not response:
+                if self.process is process:
+                    self._reset()
+                return
+            if self._waiters:
+                waiter = self._waiters.popleft()
+                # A cancelled caller's reply is consumed, not passed on
+                if not waiter.done():
+                    waiter.set_result(response.rstrip(b'\\r\\n'))
+    
+    async def stop(self):
+        """Stop the handler subprocess."""
+        process = self.process
+        self._reset()
+        if process:
+            await process.wait()
+
+
+# Export for Zephyr handler system
+handler = GeneratedHandler()
+'''
+
+
 class HandlerGenerator:
     """Generate Zephyr-compatible message handlers using LLMs."""
     
     def __init__(self, model: str = "qwen2.5-coder:1.5b"):
         self.client = MinimalOllamaClient()
         self.model = model
+        # Generated code keyed by a hash of model, language and prompt
+        self._cache = {}
+    
+    def _generate(self, prompt: str, language: str) -> str:
+        """Generate code, reusing the response for a prompt seen before."""
+        key = hashlib.blake2b(
+            f"{self.model}\0{language}\0{prompt}".encode(), digest_size=16
+        ).hexdigest()
+        code = self._cache.get(key)
+        if code is None:
+            code = self.client.generate_code(
+                model=self.model,
+                task=prompt,
+                language=language,
+                temperature=0.3
+            )
+            self._cache[key] = code
+        return code
     
     def generate_stream_handler(self, handler_name: str, description: str) -> str:
         """
@@ -36,14 +281,7 @@ Only the code:
 ```c
 """
         
-        code = self.client.generate_code(
-            model=self.model,
-            task=prompt,
-            language="c",
-            temperature=0.3
-        )
-        
-        return code
+        return self._generate(prompt, "c")
     
     def generate_bash_handler(self, handler_name: str, description: str) -> str:
         """
@@ -62,98 +300,36 @@ Only the code:
 ```bash
 """
         
-        code = self.client.generate_code(
-            model=self.model,
-            task=prompt,
-            language="bash",
-            temperature=0.3
-        )
-        
-        return code
+        return self._generate(prompt, "bash")
     
     def compile_handler(self, code: str, output_path: Path) -> bool:
         """Compile C handler code."""
-        with tempfile.NamedTemporaryFile(suffix='.c', delete=False) as f:
-            f.write(code.encode())
-            source_file = f.name
-        
+        # Source goes to gcc on stdin, so no temporary file is written
         try:
             result = subprocess.run(
-                ['gcc', '-O2', '-o', str(output_path), source_file],
+                ['gcc', '-O2', '-pipe', '-o', str(output_path), '-x', 'c', '-'],
+                input=code.encode(),
                 capture_output=True,
                 timeout=5
             )
             return result.returncode == 0
         except:
             return False
-        finally:
-            Path(source_file).unlink(missing_ok=True)
     
-    def create_handler_wrapper(self, handler_path: Path, handler_type: str) -> str:
+    def create_handler_wrapper(self, handler_path: Path, handler_type: str,
+                               one_reply_per_line: bool = False) -> str:
         """
         Create a Python wrapper that integrates with Zephyr's handler system.
+        
+        Set one_reply_per_line only for binaries that never filter out a
+        message; the wrapper then pipelines messages instead of sending one
+        at a time.
         """
-        wrapper = f'''#!/usr/bin/env python3
-"""
-Auto-generated Zephyr handler wrapper.
-Bridges between Python handler system and compiled binary handler.
-"""
-
-import subprocess
-import asyncio
-from typing import Optional
-
-
-class GeneratedHandler:
-    """Handler that delegates to compiled binary."""
-    
-    def __init__(self):
-        self.handler_path = "{handler_path}"
-        self.handler_type = "{handler_type}"
-        self.process = None
-    
-    async def start(self):
-        """Start the handler subprocess."""
-        self.process = await asyncio.create_subprocess_exec(
-            self.handler_path,
-            stdin=asyncio.subprocess.PIPE,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.DEVNULL
+        return _WRAPPER_TEMPLATE.format(
+            handler_path=handler_path,
+            handler_type=handler_type,
+            one_reply_per_line=bool(one_reply_per_line)
         )
-    
-    async def handle(self, message: dict) -> Optional[str]:
-        """Process a message through the handler."""
-        if not self.process:
-            await self.start()
-        
-        # Format message for handler
-        msg_line = f"{{message.get('type', 'unknown')}} {{message.get('data', '')}}"
-        
-        # Send to handler and get response
-        self.process.stdin.write(msg_line.encode() + b'\\n')
-        await self.process.stdin.drain()
-        
-        # Read response (with timeout)
-        try:
-            response = await asyncio.wait_for(
-                self.process.stdout.readline(),
-                timeout=1.0
-            )
-            return response.decode().strip()
-        except asyncio.TimeoutError:
-            return None
-    
-    async def stop(self):
-        """Stop the handler subprocess."""
-        if self.process:
-            self.process.terminate()
-            await self.process.wait()
-
-
-# Export for Zephyr handler system
-handler = GeneratedHandler()
-'''
-        return wrapper
 
 
 def demo_handler_generation():